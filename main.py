@@ -75,6 +75,7 @@ class TranscribeApp:
 
         self.update_splash("Creating system tray...", 60, "Step 6/6: User interface")
         self.tray_app = TrayApp(self.config)
+        self.settings_window = None
 
         self.temp_dir = tempfile.mkdtemp(prefix="transcribe_")
 
@@ -330,8 +331,11 @@ class TranscribeApp:
             self.config = new_config
             self.apply_config_changes()
 
-        settings_window = SettingsWindow(self.config, on_settings_saved)
-        threading.Thread(target=settings_window.show, daemon=True).start()
+        # One window per session; it is hidden on close and refreshed on show
+        if self.settings_window is None:
+            self.settings_window = SettingsWindow(self.config, on_settings_saved)
+        self.settings_window.config = self.config
+        self.settings_window.show()
 
     def apply_config_changes(self):
         logger.info("Applying configuration changes...")
@@ -369,7 +373,8 @@ class TranscribeApp:
 
         # Update tray menu to reflect AI status
         if self.tray_app and self.tray_app.icon:
-            self.tray_app.icon.menu = self.tray_app.setup_menu()
+            self.tray_app.config = self.config
+            self.tray_app.icon.update_menu()
             logger.info(f"Tray menu updated - AI Enhancement: {'ON' if llm_enabled else 'OFF'}")
 
     def run(self):
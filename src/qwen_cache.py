@@ -0,0 +1,146 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from functools import wraps
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = Path.home() / ".cache" / "transcribeapp" / "qwen_cache.db"
+NO_CACHE_ENV = "TRANSCRIBEAPP_NO_QWEN_CACHE"
+
+
+class QwenCache:
+    """Persistent store of raw LLM generations keyed by model, settings and input tokens"""
+
+    def __init__(self, path: Path = CACHE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._memory = {}
+        self.hits = 0
+        self.misses = 0
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS outputs (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model_id: str, fn_name: str, *inputs: str) -> str:
+        # The model id is part of the key, so switching models never serves
+        # another model's output
+        payload = f"{model_id}|{fn_name}|" + "\x1f".join(inputs)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key in self._memory:
+                self.hits += 1
+                return self._memory[key]
+            row = self._conn.execute("SELECT value FROM outputs WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self.hits += 1
+                self._memory[key] = row[0]
+                return row[0]
+            self.misses += 1
+        return None
+
+    def put(self, key: str, value: str):
+        with self._lock:
+            self._memory[key] = value
+            self._conn.execute("INSERT OR REPLACE INTO outputs (key, value) VALUES (?, ?)", (key, value))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _model_id(processor) -> str:
+    return getattr(processor, 'current_model_id', None) or str(getattr(processor, 'model_path', ''))
+
+
+def _model_settings(processor) -> str:
+    # Anything besides the inputs that changes what the weights compute
+    return f"{getattr(processor, 'device', '')}|quant={os.environ.get('TRANSCRIBEAPP_TEST_QUANT', '0')}"
+
+
+def _cached_generate(processor, cache: QwenCache, generate):
+    @wraps(generate)
+    def wrapper(*args, **kwargs):
+        # Both processors call generate(**inputs, ...); anything else goes straight through
+        if args or 'input_ids' not in kwargs:
+            return generate(*args, **kwargs)
+
+        # The key is the exact model input: the token ids already contain the
+        # system prompt and the padding of the whole batch, so prompt edits miss
+        # and batched rows never answer single calls
+        tensors = {k: v.tolist() for k, v in kwargs.items() if hasattr(v, 'tolist')}
+        settings = {k: v for k, v in kwargs.items() if k not in tensors}
+        key = cache.make_key(
+            _model_id(processor),
+            'generate',
+            _model_settings(processor),
+            json.dumps(settings, sort_keys=True, default=str),
+            json.dumps(tensors, sort_keys=True)
+        )
+
+        cached = cache.get(key)
+        if cached is not None:
+            # Same device and integer dtype as the prompt ids generate() got
+            return kwargs['input_ids'].new_tensor(json.loads(cached))
+
+        outputs = generate(**kwargs)
+        cache.put(key, json.dumps(outputs.tolist()))
+        return outputs
+    return wrapper
+
+
+def _wrap_model(processor, cache: QwenCache):
+    model = getattr(processor, 'model', None)
+    if model is None or getattr(model, '_qwen_cache', None) is cache:
+        return
+    model.generate = _cached_generate(processor, cache, model.generate)
+    model._qwen_cache = cache
+
+
+def cache_processor(processor, cache: QwenCache = None):
+    """Cache a processor's raw model generations on disk, in place
+
+    Only generate() is cached; decoding, validation and the technical-terms
+    pass run on every call. Set TRANSCRIBEAPP_NO_QWEN_CACHE=1 to bypass it.
+    """
+    if processor is None or getattr(processor, '_qwen_cache', None) is not None:
+        return processor
+
+    if os.environ.get(NO_CACHE_ENV) == "1":
+        logger.info(f"Qwen output cache disabled ({NO_CACHE_ENV})")
+        return processor
+
+    cache = cache or QwenCache()
+    processor._qwen_cache = cache
+
+    # Each (re)load creates a new model object, so wrap it after initialize
+    initialize = processor.initialize
+
+    @wraps(initialize)
+    def initialize_and_cache(*args, **kwargs):
+        loaded = initialize(*args, **kwargs)
+        if loaded:
+            _wrap_model(processor, cache)
+        return loaded
+
+    processor.initialize = initialize_and_cache
+    _wrap_model(processor, cache)
+
+    logger.info(f"Qwen output cache enabled at {cache.path}")
+    return processor
+
+
+def get_cached_qwen_processor():
+    """Get the Qwen processor singleton with its outputs cached on disk"""
+    from src.qwen_processor import get_qwen_processor
+    return cache_processor(get_qwen_processor())
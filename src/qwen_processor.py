@@ -1,11 +1,18 @@
 import torch
 import logging
+import os
 from pathlib import Path
-from typing import Optional
+from typing import Optional, List, Tuple
 from src.technical_terms import process_technical_terms
 
 logger = logging.getLogger(__name__)
 
+CLEANING_SYSTEM_PROMPT = "Corrige errores gramaticales y elimina muletillas. Responde SOLO con el texto corregido, sin explicaciones."
+ENHANCE_SYSTEM_PROMPT = "Improve the English translation to be more natural. Keep the meaning exact. Output ONLY the improved English, no explanations."
+
+# Placeholder user message used to split the chat template around the user text
+_USER_SLOT = "\x00USER\x00"
+
 
 class QwenProcessor:
     """Qwen2.5-3B-Instruct processor - High quality Spanish text processing"""
@@ -15,6 +22,8 @@ class QwenProcessor:
         self.tokenizer = None
         self.device = None
         self.is_initialized = False
+        # system prompt -> (prefix ids, suffix ids) of the chat template
+        self._template_ids = {}
         # Use the exact path where user downloaded the model
         self.model_path = Path("LLM/Qwen2.5-3B-Instruct")
 
@@ -80,6 +89,14 @@ class QwenProcessor:
                 )
                 logger.info("Qwen2.5-3B loaded on CPU")
 
+                # CUDA already runs 4-bit; on CPU the test suite can opt into
+                # int8 dynamic quantization of the linear layers for speed
+                if os.environ.get("TRANSCRIBEAPP_TEST_QUANT") == "1":
+                    self.model = torch.quantization.quantize_dynamic(
+                        self.model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+                    logger.info("Qwen2.5-3B linear layers quantized to int8 (TRANSCRIBEAPP_TEST_QUANT)")
+
             self.model.eval()
 
             if progress_callback:
@@ -99,76 +116,31 @@ class QwenProcessor:
             return text
 
         try:
-            # Simpler prompt to avoid confusion
-            messages = [
-                {"role": "system", "content": "Corrige errores gramaticales y elimina muletillas. Responde SOLO con el texto corregido, sin explicaciones."},
-                {"role": "user", "content": text}
-            ]
-
-            # Apply chat template
-            prompt = self.tokenizer.apply_chat_template(
-                messages,
-                tokenize=False,
-                add_generation_prompt=True
-            )
-
-            inputs = self.tokenizer(
-                prompt,
-                return_tensors="pt",
-                truncation=True,
-                max_length=256
-            )
-
-            if self.device == "cuda":
-                inputs = {k: v.cuda() for k, v in inputs.items()}
-
-            with torch.no_grad():
-                outputs = self.model.generate(
-                    **inputs,
-                    max_new_tokens=len(text.split()) + 10,  # Slightly more than input
-                    temperature=0.1,    # Low temperature for consistency
-                    do_sample=False,    # Deterministic for consistency
-                    pad_token_id=self.tokenizer.pad_token_id,
-                    eos_token_id=self.tokenizer.eos_token_id
-                )
+            response = self._generate_batch(
+                [self._cleaning_prompt(text)],
+                max_new_tokens=len(text.split()) + 10  # Slightly more than input
+            )[0]
+            return self._finish_cleaning(text, response)
 
-            # Decode only the new tokens (skip the prompt)
-            generated_ids = outputs[0][len(inputs['input_ids'][0]):]
-            response = self.tokenizer.decode(generated_ids, skip_special_tokens=True)
-
-            # Clean up any role markers that might have slipped through
-            response = response.replace('assistant', '').replace('Assistant', '')
-            response = response.replace('\nassistant\n', ' ').replace('\nAssistant\n', ' ')
-            response = response.strip()
-
-            # Remove any duplicate lines
-            lines = response.split('\n')
-            unique_lines = []
-            for line in lines:
-                clean_line = line.strip()
-                if clean_line and clean_line not in unique_lines:
-                    unique_lines.append(clean_line)
-
-            cleaned = ' '.join(unique_lines)
-
-            # Final validation - if result is empty or too different, return original
-            if not cleaned or len(cleaned) < 3:
-                return text
-
-            # Check if the cleaned text is reasonable (not too different from original)
-            if len(cleaned) > len(text) * 2:
-                logger.warning(f"Qwen output too long, using original")
-                return text
+        except Exception as e:
+            logger.error(f"Spanish cleanup failed: {e}")
+            return text
 
-            # Apply technical terms correction after cleaning
-            cleaned = process_technical_terms(cleaned)
+    def clean_spanish_text_batch(self, texts: List[str]) -> List[str]:
+        """Clean several transcriptions with one batched generate call"""
+        if not self.is_initialized or not texts:
+            return list(texts)
 
-            logger.info(f"Qwen cleaned: '{text[:30]}...' -> '{cleaned[:30]}...'")
-            return cleaned
+        try:
+            responses = self._generate_batch(
+                [self._cleaning_prompt(text) for text in texts],
+                max_new_tokens=max(len(text.split()) for text in texts) + 10
+            )
+            return [self._finish_cleaning(text, response) for text, response in zip(texts, responses)]
 
         except Exception as e:
-            logger.error(f"Spanish cleanup failed: {e}")
-            return text
+            logger.error(f"Batched Spanish cleanup failed: {e}")
+            return list(texts)
 
     def enhance_translation(self, spanish: str, english: str) -> str:
         """Enhance English translation using Qwen with context"""
@@ -176,105 +148,202 @@ class QwenProcessor:
             return english
 
         try:
-            # Provide context for better translation
+            response = self._generate_batch(
+                [self._enhance_prompt(spanish, english)],
+                max_new_tokens=len(english.split()) + 20  # Similar length to input
+            )[0]
+            return self._finish_enhancement(english, response)
+
+        except Exception as e:
+            logger.error(f"Translation enhancement failed: {e}")
+            return english
+
+    def enhance_translation_batch(self, pairs: List[Tuple[str, str]]) -> List[str]:
+        """Enhance several (spanish, english) pairs with one batched generate call"""
+        if not self.is_initialized or not pairs:
+            return [english for _, english in pairs]
+
+        try:
+            responses = self._generate_batch(
+                [self._enhance_prompt(spanish, english) for spanish, english in pairs],
+                max_new_tokens=max(len(english.split()) for _, english in pairs) + 20
+            )
+            return [self._finish_enhancement(english, response)
+                    for (_, english), response in zip(pairs, responses)]
+
+        except Exception as e:
+            logger.error(f"Batched translation enhancement failed: {e}")
+            return [english for _, english in pairs]
+
+    def _cleaning_prompt(self, text: str) -> List[int]:
+        # Simpler prompt to avoid confusion
+        return self._prompt_ids(CLEANING_SYSTEM_PROMPT, text, max_length=256)
+
+    def _enhance_prompt(self, spanish: str, english: str) -> List[int]:
+        # Provide context for better translation
+        return self._prompt_ids(
+            ENHANCE_SYSTEM_PROMPT,
+            f"Spanish: {spanish}\nEnglish: {english}\nImproved English:",
+            max_length=400
+        )
+
+    def _prompt_ids(self, system: str, user: str, max_length: int) -> List[int]:
+        """Token ids of a full chat prompt; only the user text is tokenized per call"""
+        prefix, suffix = self._get_template_ids(system)
+        user_ids = self.tokenizer(user, add_special_tokens=False)["input_ids"]
+        # Truncate the user text, never the template, so the prompt still ends
+        # with the assistant turn
+        user_ids = user_ids[:max(max_length - len(prefix) - len(suffix), 0)]
+        return prefix + user_ids + suffix
+
+    def _get_template_ids(self, system: str) -> Tuple[List[int], List[int]]:
+        """Tokenize the chat template around the user message once per system prompt"""
+        ids = self._template_ids.get(system)
+        if ids is None:
             messages = [
-                {"role": "system", "content": "Improve the English translation to be more natural. Keep the meaning exact. Output ONLY the improved English, no explanations."},
-                {"role": "user", "content": f"Spanish: {spanish}\nEnglish: {english}\nImproved English:"}
+                {"role": "system", "content": system},
+                {"role": "user", "content": _USER_SLOT}
             ]
-
-            prompt = self.tokenizer.apply_chat_template(
+            template = self.tokenizer.apply_chat_template(
                 messages,
                 tokenize=False,
                 add_generation_prompt=True
             )
-
-            inputs = self.tokenizer(
-                prompt,
-                return_tensors="pt",
-                truncation=True,
-                max_length=400
+            # The template's special tokens delimit the user text, so the pieces
+            # tokenize the same apart as they do joined
+            prefix, suffix = template.split(_USER_SLOT)
+            ids = (
+                self.tokenizer(prefix, add_special_tokens=False)["input_ids"],
+                self.tokenizer(suffix, add_special_tokens=False)["input_ids"]
+            )
+            self._template_ids[system] = ids
+        return ids
+
+    def _generate_batch(self, prompts: List[List[int]], max_new_tokens: int) -> List[str]:
+        """Run one greedy generate over all prompts and decode only the new tokens"""
+        # Left padding keeps every prompt flush against its generated tokens,
+        # so the new tokens of every row start at the same column
+        padding_side = self.tokenizer.padding_side
+        self.tokenizer.padding_side = "left"
+        try:
+            inputs = self.tokenizer.pad(
+                {"input_ids": prompts},
+                padding=True,
+                return_tensors="pt"
+            )
+        finally:
+            self.tokenizer.padding_side = padding_side
+
+        if self.device == "cuda":
+            inputs = {k: v.cuda() for k, v in inputs.items()}
+
+        with torch.no_grad():
+            outputs = self.model.generate(
+                **inputs,
+                max_new_tokens=max_new_tokens,
+                temperature=0.1,    # Low temperature for consistency
+                do_sample=False,    # Deterministic for consistency
+                pad_token_id=self.tokenizer.pad_token_id,
+                eos_token_id=self.tokenizer.eos_token_id
             )
 
-            if self.device == "cuda":
-                inputs = {k: v.cuda() for k, v in inputs.items()}
-
-            with torch.no_grad():
-                outputs = self.model.generate(
-                    **inputs,
-                    max_new_tokens=len(english.split()) + 20,  # Similar length to input
-                    temperature=0.1,  # Very low for consistency
-                    do_sample=False,  # Deterministic
-                    pad_token_id=self.tokenizer.pad_token_id,
-                    eos_token_id=self.tokenizer.eos_token_id
-                )
+        # Decode only the new tokens (skip the prompt)
+        prompt_length = inputs['input_ids'].shape[1]
+        return self.tokenizer.batch_decode(outputs[:, prompt_length:], skip_special_tokens=True)
+
+    def _finish_cleaning(self, text: str, response: str) -> str:
+        """Validate a cleaning response, falling back to the original text"""
+        # Clean up any role markers that might have slipped through
+        response = response.replace('assistant', '').replace('Assistant', '')
+        response = response.replace('\nassistant\n', ' ').replace('\nAssistant\n', ' ')
+        response = response.strip()
+
+        # Remove any duplicate lines
+        lines = response.split('\n')
+        unique_lines = []
+        for line in lines:
+            clean_line = line.strip()
+            if clean_line and clean_line not in unique_lines:
+                unique_lines.append(clean_line)
+
+        cleaned = ' '.join(unique_lines)
+
+        # Final validation - if result is empty or too different, return original
+        if not cleaned or len(cleaned) < 3:
+            return text
 
-            # Decode only the new tokens (skip the prompt)
-            generated_ids = outputs[0][len(inputs['input_ids'][0]):]
-            response = self.tokenizer.decode(generated_ids, skip_special_tokens=True)
+        # Check if the cleaned text is reasonable (not too different from original)
+        if len(cleaned) > len(text) * 2:
+            logger.warning(f"Qwen output too long, using original")
+            return text
 
-            # Clean up any role markers
-            response = response.replace('assistant', '').replace('Assistant', '')
-            response = response.replace('\nassistant\n', ' ').replace('\nAssistant\n', ' ')
+        # Apply technical terms correction after cleaning
+        cleaned = process_technical_terms(cleaned)
 
-            # Remove any lines that look like prompts or instructions
-            lines = response.split('\n')
-            cleaned_lines = []
-            for line in lines:
-                line = line.strip()
-                # Skip lines that look like prompts or role markers
-                if line and not any(marker in line.lower() for marker in
-                    ['spanish:', 'english:', 'improved:', 'translated:', 'corrected:', 'fixed:', 'here']):
-                    cleaned_lines.append(line)
+        logger.info(f"Qwen cleaned: '{text[:30]}...' -> '{cleaned[:30]}...'")
+        return cleaned
 
-            enhanced = ' '.join(cleaned_lines).strip()
+    def _finish_enhancement(self, english: str, response: str) -> str:
+        """Validate an enhancement response, falling back to the original translation"""
+        # Clean up any role markers
+        response = response.replace('assistant', '').replace('Assistant', '')
+        response = response.replace('\nassistant\n', ' ').replace('\nAssistant\n', ' ')
 
-            # Remove quotes and extra whitespace
-            enhanced = enhanced.strip('"').strip("'").strip()
+        # Remove any lines that look like prompts or instructions
+        lines = response.split('\n')
+        cleaned_lines = []
+        for line in lines:
+            line = line.strip()
+            # Skip lines that look like prompts or role markers
+            if line and not any(marker in line.lower() for marker in
+                ['spanish:', 'english:', 'improved:', 'translated:', 'corrected:', 'fixed:', 'here']):
+                cleaned_lines.append(line)
 
-            # Validation checks
-            if not enhanced or len(enhanced) < 3:
-                logger.debug("Enhancement too short, using original")
-                return english
+        enhanced = ' '.join(cleaned_lines).strip()
 
-            # Check for Spanish contamination
-            spanish_indicators = ['que', 'por', 'está', 'pero', 'como', 'cuando', 'donde', 'así', 'también']
-            words = enhanced.lower().split()
-            spanish_count = sum(1 for word in spanish_indicators if word in words)
+        # Remove quotes and extra whitespace
+        enhanced = enhanced.strip('"').strip("'").strip()
 
-            if len(words) > 0 and spanish_count / len(words) > 0.2:
-                logger.warning("Enhancement contains Spanish, using original")
-                return english
+        # Validation checks
+        if not enhanced or len(enhanced) < 3:
+            logger.debug("Enhancement too short, using original")
+            return english
 
-            # Check for duplication
-            if enhanced.count(english[:20]) > 1:  # Check if beginning is repeated
-                logger.warning("Enhancement contains duplication, using original")
-                return english
+        # Check for Spanish contamination
+        spanish_indicators = ['que', 'por', 'está', 'pero', 'como', 'cuando', 'donde', 'así', 'también']
+        words = enhanced.lower().split()
+        spanish_count = sum(1 for word in spanish_indicators if word in words)
 
-            # Check length sanity (should not be too different)
-            if len(enhanced) > len(english) * 1.5 or len(enhanced) < len(english) * 0.5:
-                logger.warning(f"Enhancement length suspicious ({len(enhanced)} vs {len(english)}), using original")
-                return english
+        if len(words) > 0 and spanish_count / len(words) > 0.2:
+            logger.warning("Enhancement contains Spanish, using original")
+            return english
 
-            # Ensure key content is preserved
-            english_words = set(english.lower().split())
-            enhanced_words = set(enhanced.lower().split())
+        # Check for duplication
+        if enhanced.count(english[:20]) > 1:  # Check if beginning is repeated
+            logger.warning("Enhancement contains duplication, using original")
+            return english
 
-            # At least 50% of original words should be present
-            if len(english_words) > 2:
-                common = english_words.intersection(enhanced_words)
-                if len(common) < len(english_words) * 0.5:
-                    logger.warning("Enhancement diverged too much, using original")
-                    return english
+        # Check length sanity (should not be too different)
+        if len(enhanced) > len(english) * 1.5 or len(enhanced) < len(english) * 0.5:
+            logger.warning(f"Enhancement length suspicious ({len(enhanced)} vs {len(english)}), using original")
+            return english
 
-            # Apply technical terms correction to enhanced translation
-            enhanced = process_technical_terms(enhanced)
+        # Ensure key content is preserved
+        english_words = set(english.lower().split())
+        enhanced_words = set(enhanced.lower().split())
 
-            logger.info(f"Qwen enhanced: '{english[:30]}...' -> '{enhanced[:30]}...'")
-            return enhanced
+        # At least 50% of original words should be present
+        if len(english_words) > 2:
+            common = english_words.intersection(enhanced_words)
+            if len(common) < len(english_words) * 0.5:
+                logger.warning("Enhancement diverged too much, using original")
+                return english
 
-        except Exception as e:
-            logger.error(f"Translation enhancement failed: {e}")
-            return english
+        # Apply technical terms correction to enhanced translation
+        enhanced = process_technical_terms(enhanced)
+
+        logger.info(f"Qwen enhanced: '{english[:30]}...' -> '{enhanced[:30]}...'")
+        return enhanced
 
     def cleanup(self):
         """Clean up model from memory"""
@@ -286,6 +355,7 @@ class QwenProcessor:
             if self.tokenizer:
                 del self.tokenizer
                 self.tokenizer = None
+                self._template_ids.clear()
 
             torch.cuda.empty_cache() if torch.cuda.is_available() else None
 
@@ -9,6 +9,16 @@ from typing import Dict, List, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Try to import pyahocorasick for single-pass term matching
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    logger.warning("pyahocorasick not installed, using word lookup. Install with: pip install pyahocorasick")
+
+_TOKEN_RE = re.compile(r'\S+')
+
 # Common technical terms and their Spanish misinterpretations
 TECHNICAL_CORRECTIONS = {
     # English terms commonly misheard in Spanish
@@ -109,16 +119,41 @@ CONTEXTUAL_PATTERNS = [
     (r'\brequaierments\.txt\b', r'requirements.txt'),
 ]
 
+# Words that suggest the speaker is talking about code
+CODE_INDICATORS = [
+    'código', 'code', 'programa', 'function', 'función',
+    'archivo', 'file', 'carpeta', 'folder', 'directorio',
+    'instalar', 'install', 'ejecutar', 'run', 'comando',
+    'error', 'bug', 'debug', 'test', 'prueba'
+]
+
+# One alternation instead of a substring check per indicator. No \b on
+# purpose: inflected forms such as "archivos" or "debuggear" must still count
+_CODE_CONTEXT_RE = re.compile('|'.join(map(re.escape, CODE_INDICATORS)))
+
 class TechnicalTermsProcessor:
     """Processes text to correct technical terms misheard in Spanish context"""
 
     def __init__(self):
         self.corrections = TECHNICAL_CORRECTIONS.copy()
         self.patterns = CONTEXTUAL_PATTERNS.copy()
+        self._automaton = None  # built on first use, reset by add_custom_term
 
     def add_custom_term(self, misheard: str, correct: str):
         """Add a custom technical term correction"""
         self.corrections[misheard.lower()] = correct
+        self._automaton = None
+
+    def _get_automaton(self):
+        if self._automaton is None:
+            automaton = ahocorasick.Automaton()
+            for misheard, correct in self.corrections.items():
+                # Words are matched one at a time, so multi-word keys never apply
+                if misheard and not any(c.isspace() for c in misheard):
+                    automaton.add_word(misheard, (misheard, correct))
+            automaton.make_automaton()
+            self._automaton = automaton
+        return self._automaton
 
     def process_text(self, text: str) -> str:
         """Process text to fix technical terms"""
@@ -133,7 +168,24 @@ class TechnicalTermsProcessor:
             processed = re.sub(pattern, replacement, processed, flags=re.IGNORECASE)
 
         # Then apply word-by-word corrections
-        words = processed.split()
+        lowered = processed.lower()
+        if AHOCORASICK_AVAILABLE and len(lowered) == len(processed):
+            result = self._correct_words_automaton(processed, lowered)
+        else:
+            result = self._correct_words(processed)
+
+        # Final cleanup - fix spacing issues
+        result = re.sub(r'\s+', ' ', result)  # Multiple spaces to single
+        result = re.sub(r'\s+([.,;!?])', r'\1', result)  # Remove space before punctuation
+
+        if result != original_text:
+            logger.info(f"Technical terms corrected: '{original_text[:30]}...' -> '{result[:30]}...'")
+
+        return result
+
+    def _correct_words(self, text: str) -> str:
+        """Look up each whitespace-separated word (minus one trailing punctuation mark)"""
+        words = text.split()
         corrected_words = []
 
         for word in words:
@@ -158,28 +210,35 @@ class TechnicalTermsProcessor:
             else:
                 corrected_words.append(word)
 
-        result = ' '.join(corrected_words)
-
-        # Final cleanup - fix spacing issues
-        result = re.sub(r'\s+', ' ', result)  # Multiple spaces to single
-        result = re.sub(r'\s+([.,;!?])', r'\1', result)  # Remove space before punctuation
-
-        if result != original_text:
-            logger.info(f"Technical terms corrected: '{original_text[:30]}...' -> '{result[:30]}...'")
-
-        return result
+        return ' '.join(corrected_words)
+
+    def _correct_words_automaton(self, text: str, lowered: str) -> str:
+        """Same result as _correct_words, with all terms found in one automaton pass"""
+        # Word start -> (word index, end without one trailing punctuation mark)
+        spans = []
+        by_start = {}
+        for match in _TOKEN_RE.finditer(text):
+            start, end = match.span()
+            clean_end = end if text[end - 1].isalnum() else end - 1
+            by_start[start] = (len(spans), clean_end)
+            spans.append((start, end))
+
+        replacements = {}
+        for last, (misheard, correct) in self._get_automaton().iter(lowered):
+            start = last - len(misheard) + 1
+            word = by_start.get(start)
+            # Only a match covering exactly one whole word counts
+            if word is not None and word[1] == last + 1:
+                index = word[0]
+                end = spans[index][1]
+                replacements[index] = correct + text[last + 1:end]
+                logger.debug(f"Corrected: '{text[start:end]}' -> '{correct}'")
+
+        return ' '.join(replacements.get(i, text[start:end]) for i, (start, end) in enumerate(spans))
 
     def detect_code_context(self, text: str) -> bool:
         """Detect if the text is likely discussing code/technical topics"""
-        code_indicators = [
-            'código', 'code', 'programa', 'function', 'función',
-            'archivo', 'file', 'carpeta', 'folder', 'directorio',
-            'instalar', 'install', 'ejecutar', 'run', 'comando',
-            'error', 'bug', 'debug', 'test', 'prueba'
-        ]
-
-        lower_text = text.lower()
-        return any(indicator in lower_text for indicator in code_indicators)
+        return _CODE_CONTEXT_RE.search(text.lower()) is not None
 
     def suggest_corrections(self, text: str) -> List[Tuple[str, str]]:
         """Suggest possible corrections without applying them"""
@@ -1,11 +1,6 @@
-import win32api
-import win32gui
-import win32con
-import win32clipboard
-import win32process
-import pyperclip
 import time
 import logging
+import importlib
 from typing import Optional, List, Tuple
 import ctypes
 from ctypes import wintypes
@@ -13,6 +8,147 @@ import threading
 
 logger = logging.getLogger(__name__)
 
+# Virtual key codes (winuser.h)
+VK_TAB = 0x09
+VK_RETURN = 0x0D
+VK_CONTROL = 0x11
+
+# SendInput constants (winuser.h)
+INPUT_KEYBOARD = 1
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_UNICODE = 0x0004
+KEYEVENTF_SCANCODE = 0x0008
+MAPVK_VK_TO_VSC = 0
+
+# Process and clipboard constants (winnt.h, winuser.h, winbase.h)
+PROCESS_VM_READ = 0x0010
+PROCESS_QUERY_INFORMATION = 0x0400
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+CF_UNICODETEXT = 13
+GMEM_MOVEABLE = 0x0002
+
+# In auto mode, text longer than this (or with non-ASCII characters) is
+# pasted rather than typed
+PASTE_THRESHOLD = 8
+
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ('wVk', wintypes.WORD),
+        ('wScan', wintypes.WORD),
+        ('dwFlags', wintypes.DWORD),
+        ('time', wintypes.DWORD),
+        ('dwExtraInfo', ctypes.c_size_t)
+    ]
+
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ('dx', wintypes.LONG),
+        ('dy', wintypes.LONG),
+        ('mouseData', wintypes.DWORD),
+        ('dwFlags', wintypes.DWORD),
+        ('time', wintypes.DWORD),
+        ('dwExtraInfo', ctypes.c_size_t)
+    ]
+
+
+class HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [
+        ('uMsg', wintypes.DWORD),
+        ('wParamL', wintypes.WORD),
+        ('wParamH', wintypes.WORD)
+    ]
+
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [('mi', MOUSEINPUT), ('ki', KEYBDINPUT), ('hi', HARDWAREINPUT)]
+
+
+class INPUT(ctypes.Structure):
+    _anonymous_ = ('u',)
+    _fields_ = [('type', wintypes.DWORD), ('u', _INPUTUNION)]
+
+
+def _key_input(vk: int, scan: int = 0, flags: int = 0) -> INPUT:
+    event = INPUT(type=INPUT_KEYBOARD)
+    event.ki = KEYBDINPUT(wVk=vk, wScan=scan, dwFlags=flags)
+    return event
+
+
+def _build_text_inputs(text: str) -> ctypes.Array:
+    """Build key down/up INPUT pairs that type `text` as UTF-16 code units.
+
+    Every record is copied from a down/up template and the wScan fields are
+    filled with strided slice writes, so no Python code runs per character.
+    Newlines and tabs are then patched into real VK_RETURN/VK_TAB presses.
+    """
+    units = text.encode('utf-16-le')
+    count = len(units) // 2
+    stride = ctypes.sizeof(INPUT)
+
+    template = (bytes(_key_input(0, 0, KEYEVENTF_UNICODE)) +
+                bytes(_key_input(0, 0, KEYEVENTF_UNICODE | KEYEVENTF_KEYUP)))
+    buffer = bytearray(template * count)
+
+    scan = INPUT.ki.offset + KEYBDINPUT.wScan.offset
+    for start in (scan, stride + scan):
+        buffer[start::2 * stride] = units[0::2]
+        buffer[start + 1::2 * stride] = units[1::2]
+
+    inputs = (INPUT * (2 * count)).from_buffer(buffer)
+
+    # Code unit k lives at byte offset 2k and owns records 2k (down) and 2k+1 (up)
+    for unit, vk in ((b'\n\x00', VK_RETURN), (b'\t\x00', VK_TAB)):
+        offset = units.find(unit)
+        while offset != -1:
+            if offset % 2 == 0:
+                inputs[offset].ki = KEYBDINPUT(wVk=vk)
+                inputs[offset + 1].ki = KEYBDINPUT(wVk=vk, dwFlags=KEYEVENTF_KEYUP)
+            offset = units.find(unit, offset + 1)
+
+    return inputs
+
+
+def _optional_import(name: str):
+    """Import a module on demand, returning None when it is not installed"""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        logger.warning(f"{name} not available, using ctypes fallback")
+        return None
+
+
+def _declare_prototypes(user32, kernel32):
+    """Declare pointer-sized signatures for the ctypes clipboard and process calls
+
+    Call this only on the injector's own WinDLL handles, never on ctypes.windll.
+    """
+    user32.OpenClipboard.argtypes = [wintypes.HWND]
+    user32.OpenClipboard.restype = wintypes.BOOL
+    user32.GetClipboardData.argtypes = [wintypes.UINT]
+    user32.GetClipboardData.restype = wintypes.HANDLE
+    user32.SetClipboardData.argtypes = [wintypes.UINT, wintypes.HANDLE]
+    user32.SetClipboardData.restype = wintypes.HANDLE
+
+    kernel32.GlobalAlloc.argtypes = [wintypes.UINT, ctypes.c_size_t]
+    kernel32.GlobalAlloc.restype = wintypes.HGLOBAL
+    kernel32.GlobalLock.argtypes = [wintypes.HGLOBAL]
+    kernel32.GlobalLock.restype = wintypes.LPVOID
+    kernel32.GlobalUnlock.argtypes = [wintypes.HGLOBAL]
+    kernel32.GlobalUnlock.restype = wintypes.BOOL
+    kernel32.GlobalFree.argtypes = [wintypes.HGLOBAL]
+    kernel32.GlobalFree.restype = wintypes.HGLOBAL
+
+    kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    kernel32.QueryFullProcessImageNameW.argtypes = [
+        wintypes.HANDLE, wintypes.DWORD, wintypes.LPWSTR, ctypes.POINTER(wintypes.DWORD)
+    ]
+    kernel32.QueryFullProcessImageNameW.restype = wintypes.BOOL
+    kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+    kernel32.CloseHandle.restype = wintypes.BOOL
+
 
 class TextInjector:
     def __init__(self):
@@ -29,18 +165,27 @@ class TextInjector:
             'word': ['Microsoft Word', 'WINWORD.EXE']
         }
 
-        self.user32 = ctypes.windll.user32
-        self.kernel32 = ctypes.windll.kernel32
+        # Private handles: prototypes declared on ctypes.windll would change
+        # the signatures seen by every other module in the process
+        self.user32 = ctypes.WinDLL('user32', use_last_error=True)
+        self.kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        _declare_prototypes(self.user32, self.kernel32)
+        self._title_buf = ctypes.create_unicode_buffer(512)
+
+        # pywin32 is only needed once injection starts, so load it here
+        # instead of at import time; ctypes covers it if missing
+        self._win32api = _optional_import('win32api')
+        self._win32process = _optional_import('win32process')
 
         logger.info("TextInjector initialized")
 
     def get_active_window(self) -> Tuple[Optional[int], Optional[str]]:
         try:
-            hwnd = win32gui.GetForegroundWindow()
-            if hwnd:
-                window_title = win32gui.GetWindowText(hwnd)
-                return hwnd, window_title
-            return None, None
+            hwnd = self.user32.GetForegroundWindow()
+            if not hwnd:
+                return None, None
+            length = self.user32.GetWindowTextW(hwnd, self._title_buf, len(self._title_buf))
+            return hwnd, self._title_buf.value if length else ''
         except Exception as e:
             logger.error(f"Failed to get active window: {e}")
             return None, None
@@ -51,12 +196,9 @@ class TextInjector:
             if not hwnd:
                 return None
 
-            _, pid = win32process.GetWindowThreadProcessId(hwnd)
-            handle = win32api.OpenProcess(win32con.PROCESS_QUERY_INFORMATION | win32con.PROCESS_VM_READ, 0, pid)
+            exe_name = self._get_process_image(hwnd)
 
-            if handle:
-                exe_name = win32process.GetModuleFileNameEx(handle, 0)
-                win32api.CloseHandle(handle)
+            if exe_name:
                 app_name = exe_name.split('\\')[-1].lower()
 
                 for app_key, app_identifiers in self.supported_apps.items():
@@ -71,9 +213,35 @@ class TextInjector:
             logger.error(f"Failed to get active application: {e}")
             return None
 
+    def _get_process_image(self, hwnd: int) -> Optional[str]:
+        """Return the executable path of the process owning `hwnd`"""
+        if self._win32process and self._win32api:
+            _, pid = self._win32process.GetWindowThreadProcessId(hwnd)
+            handle = self._win32api.OpenProcess(PROCESS_QUERY_INFORMATION | PROCESS_VM_READ, 0, pid)
+            if not handle:
+                return None
+            try:
+                return self._win32process.GetModuleFileNameEx(handle, 0)
+            finally:
+                self._win32api.CloseHandle(handle)
+
+        pid = wintypes.DWORD()
+        self.user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+        handle = self.kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid.value)
+        if not handle:
+            return None
+        try:
+            size = wintypes.DWORD(260)
+            path = ctypes.create_unicode_buffer(size.value)
+            if self.kernel32.QueryFullProcessImageNameW(handle, 0, path, ctypes.byref(size)):
+                return path.value
+            return None
+        finally:
+            self.kernel32.CloseHandle(handle)
+
     def inject_text(self, text: str, method: str = 'auto') -> bool:
-        if not text:
-            logger.warning("Empty text, nothing to inject")
+        if not text or not text.strip():
+            logger.debug("Empty or whitespace-only text, nothing to inject")
             return False
 
         try:
@@ -88,6 +256,9 @@ class TextInjector:
                     return self._inject_whatsapp_safe(text)
                 elif active_app in ['discord', 'teams', 'slack']:
                     return self._inject_via_clipboard_paste(text)
+                elif len(text) > PASTE_THRESHOLD or not text.isascii():
+                    # One Ctrl+V beats typing every character
+                    return self._inject_via_clipboard_paste(text)
                 else:
                     return self._inject_via_sendkeys(text)
 
@@ -110,7 +281,7 @@ class TextInjector:
 
     def _inject_via_clipboard(self, text: str) -> bool:
         try:
-            pyperclip.copy(text)
+            self._clip_set(text)
             logger.info(f"Text copied to clipboard: {text[:50]}...")
             return True
         except Exception as e:
@@ -119,16 +290,15 @@ class TextInjector:
 
     def _inject_via_clipboard_paste(self, text: str) -> bool:
         try:
-            original_clipboard = pyperclip.paste()
+            original_clipboard = self._clip_get()
 
-            pyperclip.copy(text)
-            time.sleep(0.1)
+            self._clip_set(text)
 
-            self._send_key_combination(win32con.VK_CONTROL, ord('V'))
+            self._send_key_combination(VK_CONTROL, ord('V'))
             time.sleep(0.2)
 
             if original_clipboard:
-                threading.Timer(1.0, lambda: pyperclip.copy(original_clipboard)).start()
+                threading.Timer(1.0, lambda: self._clip_write(original_clipboard)).start()
 
             logger.info("Text injected via clipboard paste")
             return True
@@ -141,23 +311,17 @@ class TextInjector:
         """Special injection method for WhatsApp to prevent duplication"""
         try:
             # Store original clipboard
-            original_clipboard = pyperclip.paste()
-
-            # Clear any existing text selection first
-            self._send_key_combination(win32con.VK_CONTROL, ord('A'))
-            time.sleep(0.1)
+            original_clipboard = self._clip_get()
 
             # Copy text to clipboard
-            pyperclip.copy(text)
-            time.sleep(0.15)  # Slightly longer wait for WhatsApp
+            self._clip_set(text)
 
-            # Paste using Ctrl+V
-            self._send_key_combination(win32con.VK_CONTROL, ord('V'))
-            time.sleep(0.3)  # Wait for paste to complete
+            # Paste using Ctrl+V as one atomic batch (no Ctrl+A, keeps any draft)
+            self._send_paste()
 
             # Restore original clipboard after a delay
             if original_clipboard:
-                threading.Timer(2.0, lambda: pyperclip.copy(original_clipboard)).start()
+                threading.Timer(2.0, lambda: self._clip_write(original_clipboard)).start()
 
             logger.info("Text injected to WhatsApp safely")
             return True
@@ -176,14 +340,8 @@ class TextInjector:
             # Add a small delay before typing to ensure the window is ready
             time.sleep(0.1)
 
-            for char in text:
-                if char == '\n':
-                    self._send_key(win32con.VK_RETURN)
-                elif char == '\t':
-                    self._send_key(win32con.VK_TAB)
-                else:
-                    self._send_char(char)
-                time.sleep(0.005)  # Reduced delay between chars
+            if not self._send_input_array(_build_text_inputs(text)):
+                return False
 
             logger.info("Text injected via sendkeys")
             return True
@@ -193,58 +351,120 @@ class TextInjector:
             return False
 
     def _send_key(self, key_code: int):
-        self.user32.keybd_event(key_code, 0, 0, 0)
-        time.sleep(0.01)
-        self.user32.keybd_event(key_code, 0, win32con.KEYEVENTF_KEYUP, 0)
-
-    def _send_char(self, char: str):
-        vk = win32api.VkKeyScan(char)
-        if vk == -1:
-            return
-
-        shift_state = (vk >> 8) & 1
-
-        if shift_state:
-            self.user32.keybd_event(win32con.VK_SHIFT, 0, 0, 0)
-
-        self.user32.keybd_event(vk & 0xFF, 0, 0, 0)
-        time.sleep(0.01)
-        self.user32.keybd_event(vk & 0xFF, 0, win32con.KEYEVENTF_KEYUP, 0)
-
-        if shift_state:
-            self.user32.keybd_event(win32con.VK_SHIFT, 0, win32con.KEYEVENTF_KEYUP, 0)
+        self._send_keys_batch([(key_code, 0), (key_code, KEYEVENTF_KEYUP)])
 
     def _send_key_combination(self, modifier: int, key: int):
-        """Send key combination with proper timing"""
-        # Press modifier
-        self.user32.keybd_event(modifier, 0, 0, 0)
-        time.sleep(0.05)
-
-        # Press key
-        self.user32.keybd_event(key, 0, 0, 0)
-        time.sleep(0.05)
+        """Send key combination as one press/release sequence"""
+        self._send_keys_batch([
+            (modifier, 0),
+            (key, 0),
+            (key, KEYEVENTF_KEYUP),  # Release key first
+            (modifier, KEYEVENTF_KEYUP)
+        ])
+
+    def _send_keys_batch(self, keys: List[Tuple[int, int]]) -> bool:
+        """Send (virtual key, flags) events with a single SendInput call"""
+        return self._send_input([
+            _key_input(vk, self.user32.MapVirtualKeyW(vk, MAPVK_VK_TO_VSC), flags)
+            for vk, flags in keys
+        ])
+
+    def _send_input(self, events: List[INPUT]) -> bool:
+        """Deliver a sequence of input events with a single SendInput call"""
+        return self._send_input_array((INPUT * len(events))(*events))
+
+    def _send_input_array(self, array: ctypes.Array) -> bool:
+        count = len(array)
+        sent = self.user32.SendInput(count, array, ctypes.sizeof(INPUT))
+        if sent != count:
+            logger.warning(f"SendInput delivered {sent}/{count} events")
+        return sent == count
+
+    def _send_paste(self) -> bool:
+        """Send Ctrl+V through the scan code path in one SendInput batch"""
+        v_key = ord('V')
+        return self._send_keys_batch([
+            (VK_CONTROL, KEYEVENTF_SCANCODE),
+            (v_key, KEYEVENTF_SCANCODE),
+            (v_key, KEYEVENTF_SCANCODE | KEYEVENTF_KEYUP),
+            (VK_CONTROL, KEYEVENTF_SCANCODE | KEYEVENTF_KEYUP)
+        ])
+
+    def _clip_set(self, text: str) -> bool:
+        """Copy text to the clipboard and wait until the write is visible"""
+        sequence = self.user32.GetClipboardSequenceNumber()
+        self._clip_write(text)
+        if not self._wait_clipboard_change(sequence, timeout=0.1):
+            logger.debug("Clipboard sequence did not advance, continuing anyway")
+            return False
+        return True
 
-        # Release key first
-        self.user32.keybd_event(key, 0, win32con.KEYEVENTF_KEYUP, 0)
-        time.sleep(0.05)
+    def _clip_write(self, text: str):
+        """Place text on the clipboard as CF_UNICODETEXT"""
+        data = ctypes.create_unicode_buffer(text)
+        size = ctypes.sizeof(data)
 
-        # Release modifier
-        self.user32.keybd_event(modifier, 0, win32con.KEYEVENTF_KEYUP, 0)
-        time.sleep(0.05)  # Extra delay after release
+        if not self._open_clipboard():
+            raise OSError("Clipboard is locked by another application")
+        try:
+            self.user32.EmptyClipboard()
+            handle = self.kernel32.GlobalAlloc(GMEM_MOVEABLE, size)
+            if not handle:
+                raise MemoryError("GlobalAlloc failed for clipboard data")
+            ctypes.memmove(self.kernel32.GlobalLock(handle), data, size)
+            self.kernel32.GlobalUnlock(handle)
+            if not self.user32.SetClipboardData(CF_UNICODETEXT, handle):
+                self.kernel32.GlobalFree(handle)
+                raise OSError("SetClipboardData failed")
+        finally:
+            self.user32.CloseClipboard()
+
+    def _clip_get(self) -> str:
+        """Read CF_UNICODETEXT from the clipboard, empty string if none"""
+        if not self._open_clipboard():
+            return ''
+        try:
+            handle = self.user32.GetClipboardData(CF_UNICODETEXT)
+            if not handle:
+                return ''
+            locked = self.kernel32.GlobalLock(handle)
+            if not locked:
+                return ''
+            try:
+                return ctypes.wstring_at(locked)
+            finally:
+                self.kernel32.GlobalUnlock(handle)
+        finally:
+            self.user32.CloseClipboard()
+
+    def _open_clipboard(self, attempts: int = 10) -> bool:
+        """Open the clipboard, retrying while another process holds it"""
+        for _ in range(attempts):
+            if self.user32.OpenClipboard(None):
+                return True
+            time.sleep(0.015)
+        return False
+
+    def _wait_clipboard_change(self, sequence: int, timeout: float) -> bool:
+        """Poll the clipboard sequence number until it moves past `sequence`"""
+        deadline = time.perf_counter() + timeout
+        while self.user32.GetClipboardSequenceNumber() == sequence:
+            if time.perf_counter() >= deadline:
+                return False
+            time.sleep(0.002)
+        return True
 
     def is_text_field_active(self) -> bool:
         try:
-            hwnd = win32gui.GetForegroundWindow()
+            hwnd = self.user32.GetForegroundWindow()
             if not hwnd:
                 return False
 
-            class_name = win32gui.GetClassName(hwnd)
-
             text_field_classes = ['Edit', 'RichEdit', 'Scintilla', 'TMemo', 'TEdit']
 
-            focused_control = win32gui.GetFocus()
+            focused_control = self.user32.GetFocus()
             if focused_control:
-                control_class = win32gui.GetClassName(focused_control)
+                control_class = self._get_class_name(focused_control)
                 if any(tc in control_class for tc in text_field_classes):
                     return True
 
@@ -255,6 +475,12 @@ class TextInjector:
             return False
 
 
+    def _get_class_name(self, hwnd: int) -> str:
+        class_name = ctypes.create_unicode_buffer(256)
+        self.user32.GetClassNameW(hwnd, class_name, 256)
+        return class_name.value
+
+
 class SafeTextInjector(TextInjector):
     def __init__(self):
         super().__init__()
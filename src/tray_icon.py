@@ -0,0 +1,44 @@
+import pystray
+
+
+if pystray.Icon.__module__ == 'pystray._win32':
+    from pystray._util import win32
+
+    class TrayIcon(pystray.Icon):
+        """pystray Icon that turns each distinct image into an HICON only once
+
+        The stock Windows backend writes the image to a temporary .ico file and
+        calls LoadImage on every icon change, destroying the previous handle.
+        The tray only ever cycles through a few cached images, so their
+        handles are kept until the icon goes away and reused on each update.
+        """
+
+        def __init__(self, *args, **kwargs):
+            # id(image) -> (image, HICON); the image reference keeps the id valid
+            self._handles = {}
+            super().__init__(*args, **kwargs)
+
+        def _assert_icon_handle(self):
+            if self._icon_handle:
+                return
+
+            cached = self._handles.get(id(self.icon))
+            if cached is not None:
+                self._icon_handle = cached[1]
+                return
+
+            super()._assert_icon_handle()
+            self._handles[id(self.icon)] = (self.icon, self._icon_handle)
+
+        def _release_icon(self):
+            # Handles are shared through _handles; they are destroyed in __del__
+            self._icon_handle = None
+
+        def __del__(self):
+            super().__del__()
+            for _image, handle in self._handles.values():
+                win32.DestroyIcon(handle)
+            self._handles.clear()
+else:
+    # Other backends hand the image to the toolkit directly
+    TrayIcon = pystray.Icon
@@ -1,11 +1,17 @@
 import pystray
-from PIL import Image, ImageDraw, ImageFont
+from tray_icon import TrayIcon
+from PIL import Image, ImageDraw
 import threading
-import customtkinter as ctk
 from typing import Optional, Callable
 import logging
 import json
 import os
+import sys
+import ctypes
+import io
+import functools
+import hashlib
+import time
 from datetime import datetime
 import queue
 import tkinter as tk
@@ -13,8 +19,352 @@ from tkinter import messagebox
 
 logger = logging.getLogger(__name__)
 
+# customtkinter is only needed once Settings opens; _load_ctk() imports it
+# (on the Tk thread) and binds it here
+ctk = None
+
+# Device enumeration needs PortAudio; if it cannot load, the Settings window
+# offers only the default device instead of retrying the import on every open
+try:
+    import sounddevice
+    from audio_handler import AudioRecorder
+    _AUDIO_OK = True
+except (ImportError, OSError) as e:
+    _AUDIO_OK = False
+    logger.warning(f"Audio device listing unavailable: {e}")
+
+_HELP_TEXT = """TranscribeApp - Quick Help Guide
+
+HOW TO USE:
+1. Click the system tray icon or press Ctrl+Shift+R to start recording
+2. Speak clearly in Spanish
+3. Stop speaking (3 seconds of silence ends recording)
+4. English translation appears automatically in active window
+
+KEYBOARD SHORTCUTS:
+• Ctrl+Shift+R - Start/Stop recording
+• Ctrl+Shift+T - Enable/Disable app
+
+REQUIREMENTS:
+• Qwen2.5-3B AI Model must be installed
+• Place model files in: C:\\Program Files\\TranscribeApp\\LLM\\Qwen2.5-3B-Instruct\\
+• Download from: https://huggingface.co/Qwen/Qwen2.5-3B-Instruct
+
+TIPS:
+• Speak clearly for best results
+• Wait for "Ready" status before recording
+• Processing takes ~3 seconds
+• Text is automatically typed where cursor is
+
+TROUBLESHOOTING:
+• "Model not found" - Download and install AI model
+• "CUDA error" - Update NVIDIA drivers
+• "Out of memory" - Close other applications
+• No text appearing - Check if cursor is in text field
+
+For more help, check README.txt in installation folder."""
+
+_ABOUT_TEXT = """TranscribeApp v1.0
+
+AI-Powered Spanish to English Voice Translation
+
+Features:
+• Real-time Spanish speech recognition
+• AI-enhanced translation using Qwen2.5-3B
+• Automatic text injection into active window
+• System-wide hotkey support
+• Handles unclear speech intelligently
+
+System Requirements:
+• Windows 10/11 64-bit
+• NVIDIA GPU with CUDA support
+• 16GB RAM minimum
+• 10GB disk space
+
+© 2024 TranscribeApp
+Licensed under MIT License
+
+For support and documentation:
+Check README.txt in installation folder"""
+
+_DOWNLOAD_GUIDE_TEXT = """Model Download Guide
+
+RECOMMENDED MODELS:
+
+1. Llama 3.2 3B (Meta) - Best English fluency
+   • Download: https://huggingface.co/meta-llama/Llama-3.2-3B-Instruct
+   • Size: 6GB
+   • Place in: LLM/Llama-3.2-3B-Instruct/
+
+2. Llama 3.2 1B (Meta) - Lightweight option
+   • Download: https://huggingface.co/meta-llama/Llama-3.2-1B-Instruct
+   • Size: 2GB (saves 4GB vs Qwen)
+   • Place in: LLM/Llama-3.2-1B-Instruct/
+
+3. Phi 3.5 Mini (Microsoft) - Good balance
+   • Download: https://huggingface.co/microsoft/Phi-3.5-mini-instruct
+   • Size: 3GB
+   • Place in: LLM/Phi-3.5-mini-instruct/
+
+4. Gemma 2 2B (Google) - Efficient
+   • Download: https://huggingface.co/google/gemma-2-2b-it
+   • Size: 4GB
+   • Place in: LLM/gemma-2-2b-it/
+
+HOW TO DOWNLOAD:
+1. Click the HuggingFace link
+2. Click "Files and versions" tab
+3. Download ALL files to the model folder
+4. Restart TranscribeApp
+5. Select the model in Settings
+
+Using Git LFS (easier):
+git lfs install
+cd LLM
+git clone [huggingface-url]"""
+
+_AI_INFO_TEXT = """When AI Enhancement is disabled:
+• Basic text cleaning will still work
+• Translations will be more literal
+• Processing will be faster
+• Less memory usage"""
+
+# Tray icons never change at runtime. They ship pre-rendered in assets/icons
+# (one PNG per cache key, named after the status) and are decoded once per
+# process; _render_icon is the source for those files and the fallback when
+# one is missing
+_ICON_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'assets', 'icons')
+_ICONS: dict[tuple[str, bool], Image.Image] = {}
+_ICONS_READY = False
+_ICONS_LOCK = threading.Lock()
+_ICON_STATUSES = ('ready', 'recording', 'processing', 'success', 'error')
+
+
+_STATUS_COLORS = {
+    'ready': (100, 100, 100, 255),
+    'recording': (255, 0, 0, 255),
+    'processing': (255, 165, 0, 255),
+    'success': (0, 255, 0, 255),
+    'error': (255, 0, 0, 255),
+    'disabled': (50, 50, 50, 255)
+}
+_WHITE = (255, 255, 255, 255)
+_ICON_BBOX = (8, 8, 56, 56)
+_DOT_BBOX = (24, 24, 40, 40)
+_CROSS_LINES = ((20, 20, 44, 44), (44, 20, 20, 44))
+
+# Scratch canvas shared by every render; callers must hold _CANVAS_LOCK and
+# copy the result out (the PNG round-trip does) before releasing it
+_CANVAS = Image.new('RGBA', (64, 64), (0, 0, 0, 0))
+_CANVAS_DRAW = ImageDraw.Draw(_CANVAS)
+_CANVAS_LOCK = threading.Lock()
+
+
+def _render_icon(status: str, disabled: bool) -> Image.Image:
+    image = _CANVAS
+    draw = _CANVAS_DRAW
+    draw.rectangle([0, 0, 64, 64], fill=(0, 0, 0, 0))
+
+    color = _STATUS_COLORS.get(status, _STATUS_COLORS['ready'])
+
+    # Override color if disabled
+    if disabled:
+        color = _STATUS_COLORS['disabled']
+
+    draw.ellipse(_ICON_BBOX, fill=color, outline=_WHITE)
+
+    if status == 'recording' and not disabled:
+        draw.ellipse(_DOT_BBOX, fill=_WHITE)
+    elif disabled:
+        # Draw an X for disabled state
+        for line in _CROSS_LINES:
+            draw.line(line, fill=_WHITE, width=3)
+
+    return image
+
+
+def _icon_key(status: str, disabled: bool) -> tuple[str, bool]:
+    """Map a status to the key of the image that represents it"""
+    # Every disabled icon is the same grey X, and unknown statuses draw as ready
+    if disabled:
+        return ('disabled', True)
+    return (status if status in _ICON_STATUSES else 'ready', False)
+
+
+def _make_icon(status: str, disabled: bool) -> Image.Image:
+    with _CANVAS_LOCK:
+        return _icon_from_png(_render_icon(status, disabled))
+
+
+def _icon_from_png(image: Image.Image) -> Image.Image:
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG', optimize=True)
+    buffer.seek(0)
+    # load() decodes now so the image no longer needs the buffer; no copy
+    icon = Image.open(buffer)
+    icon.load()
+    return icon
+
+
+def _load_icon(status: str, disabled: bool) -> Image.Image:
+    """Load a pre-rendered icon from assets/icons, drawing it if missing"""
+    path = os.path.join(_ICON_DIR, f"{status}.png")
+    try:
+        image = Image.open(path)
+        image.load()
+        return image
+    except OSError as e:
+        logger.warning(f"Icon {path} unavailable ({e}), drawing it instead")
+        return _make_icon(status, disabled)
+
+
+def _build_icon_assets(statuses):
+    """Populate _ICONS for every status, enabled and disabled, on first use"""
+    global _ICONS_READY
+    with _ICONS_LOCK:
+        if _ICONS_READY:
+            return
+        for key in {_icon_key(status, disabled) for status in statuses for disabled in (False, True)}:
+            _ICONS[key] = _load_icon(*key)
+        _ICONS_READY = True
+
+
+# One hidden Tk root serves every dialog. It runs its event loop on a
+# dedicated thread because the main thread is parked in TranscribeApp.run().
+# Other threads never touch Tk directly: they queue callables that the Tk
+# thread drains every _TK_POLL_MS
+_TK_POLL_MS = 50
+_TK_START_TIMEOUT = 10.0
+_tk_root = None
+_tk_thread = None
+_tk_error: Optional[BaseException] = None
+_tk_ready = threading.Event()
+_tk_lock = threading.Lock()
+_tk_queue: queue.Queue = queue.Queue()
+
+
+def _tk_main():
+    global _tk_root, _tk_error
+    try:
+        root = tk.Tk()
+        root.withdraw()
+        _tk_root = root
+    except Exception as e:
+        # No display, broken Tcl install...: record it so callers fail fast
+        _tk_error = e
+        return
+    finally:
+        _tk_ready.set()
+    _tk_root.after(_TK_POLL_MS, _drain_tk_queue)
+    _tk_root.mainloop()
+
+
+def _drain_tk_queue():
+    while True:
+        try:
+            func = _tk_queue.get_nowait()
+        except queue.Empty:
+            break
+        try:
+            func()
+        except Exception as e:
+            logger.error(f"UI callback failed: {e}")
+    _tk_root.after(_TK_POLL_MS, _drain_tk_queue)
+
+
+def _get_tk_root() -> Optional[tk.Tk]:
+    """Return the shared hidden Tk root, starting its event loop on first use; None if Tk is unavailable"""
+    global _tk_thread
+    with _tk_lock:
+        if _tk_thread is None:
+            _tk_thread = threading.Thread(target=_tk_main, name="TkRoot", daemon=True)
+            _tk_thread.start()
+    if not _tk_ready.wait(_TK_START_TIMEOUT):
+        logger.error("Tk did not start in time; dialogs are unavailable")
+        return None
+    if _tk_error is not None:
+        logger.error(f"Tk failed to start, dialogs are unavailable: {_tk_error}")
+        return None
+    return _tk_root
+
+
+def _run_on_tk(func: Callable):
+    """Schedule func on the Tk thread; dropped (and logged) if Tk could not start"""
+    if _get_tk_root() is None:
+        return
+    _tk_queue.put(func)
+
+
+def _load_ctk():
+    """Import customtkinter and apply the app theme on first use"""
+    global ctk
+    if ctk is None:
+        import customtkinter
+        customtkinter.set_appearance_mode("dark")
+        customtkinter.set_default_color_theme("blue")
+        ctk = customtkinter
+    return ctk
+
+
+MB_ICONINFORMATION = 0x40
+
+
+def _show_info(title: str, text: str, owner=None):
+    """Show an information box owned by `owner`: a Tk window or a native hwnd"""
+    on_tk_thread = threading.current_thread() is _tk_thread
+    if sys.platform == 'win32' and not on_tk_thread and not isinstance(owner, tk.Misc):
+        # Off the Tk thread (the tray's): the box's modal loop pumps that
+        # thread's messages and never stalls the Tk queue
+        ctypes.windll.user32.MessageBoxW(owner or 0, text, title, MB_ICONINFORMATION)
+        return
+
+    # Tk's dialog keeps servicing Tcl events (and so _drain_tk_queue) while
+    # it is open, and is modal to its parent window
+    parent = owner if isinstance(owner, tk.Misc) else None
+    show = lambda: messagebox.showinfo(title, text, parent=parent)
+    if on_tk_thread:
+        show()
+    else:
+        _run_on_tk(show)
+
+
+# The LLM folder scan stats every model file, so it is started in the
+# background when the tray comes up and consumed by the first Settings open
+_prescanned_models = None
+_prescan_done = threading.Event()
+
+
+def _prescan_models():
+    global _prescanned_models
+    try:
+        from model_scanner import ModelScanner
+        _prescanned_models = ModelScanner("LLM").scan_models()
+    except Exception as e:
+        logger.warning(f"Background model scan failed: {e}")
+    finally:
+        _prescan_done.set()
+
+
+def _wait_prescanned(timeout: float):
+    """Return the background scan result once, or None if it is not ready"""
+    global _prescanned_models
+    if not _prescan_done.wait(timeout):
+        return None
+    models, _prescanned_models = _prescanned_models, None
+    return models
+
+
+def _atomic_write(path: str, payload: bytes):
+    """Write payload to a temp file and swap it in with os.replace"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
 
 class TrayApp:
+    STATUS_RATE_HZ = 30
+
     def __init__(self, config: dict):
         self.config = config
         self.icon = None
@@ -24,6 +374,10 @@ class TrayApp:
         self.callback_exit = None
         self.is_recording = False
 
+        # Latest-wins slot drained by _status_worker at most STATUS_RATE_HZ
+        self._status_q = queue.Queue(maxsize=1)
+        self._last_icon_key = None
+
         self.status_icons = {
             'ready': '⚪',
             'recording': '🔴',
@@ -32,75 +386,94 @@ class TrayApp:
             'error': '❌'
         }
 
-        logger.info("TrayApp initialized")
-
-    def create_icon(self, status: str = 'ready', disabled: bool = False) -> Image.Image:
-        width = 64
-        height = 64
-        image = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(image)
-
-        colors = {
-            'ready': (100, 100, 100, 255),
-            'recording': (255, 0, 0, 255),
-            'processing': (255, 165, 0, 255),
-            'success': (0, 255, 0, 255),
-            'error': (255, 0, 0, 255),
-            'disabled': (50, 50, 50, 255)
-        }
-
-        color = colors.get(status, colors['ready'])
+        _build_icon_assets(self.status_icons)
+        self._menu = self.setup_menu()
 
-        # Override color if disabled
-        if disabled:
-            color = colors['disabled']
+        self._model_scan_thread = threading.Thread(target=_prescan_models, daemon=True)
+        self._model_scan_thread.start()
 
-        draw.ellipse([8, 8, 56, 56], fill=color, outline=(255, 255, 255, 255))
-
-        if status == 'recording' and not disabled:
-            draw.ellipse([24, 24, 40, 40], fill=(255, 255, 255, 255))
-        elif disabled:
-            # Draw an X for disabled state
-            draw.line([20, 20, 44, 44], fill=(255, 255, 255, 255), width=3)
-            draw.line([44, 20, 20, 44], fill=(255, 255, 255, 255), width=3)
+        logger.info("TrayApp initialized")
 
-        return image
+    def create_icon(self, status: str = 'ready', disabled: bool = False) -> Image.Image:
+        key = _icon_key(status, disabled)
+        icon = _ICONS.get(key)
+        if icon is None:
+            icon = _ICONS.setdefault(key, _load_icon(*key))
+        return icon
 
     def update_status(self, status: str, message: str = None, disabled: bool = False):
         self.status = status
-        if self.icon:
-            self.icon.icon = self.create_icon(status, disabled)
-
-            if message and self.config['ui']['show_notifications']:
-                self.icon.notify(message, "TranscribeApp")
-
         logger.info(f"Status updated: {status} - {message} (disabled: {disabled})")
 
+        # Nothing to show if the icon would not change and there is no message
+        key = _icon_key(status, disabled)
+        if key == self._last_icon_key and not message:
+            return
+        self._last_icon_key = key
+        self._post_status((status, message, disabled))
+
+    def _post_status(self, update):
+        """Replace any pending status update with the newest one"""
+        while True:
+            try:
+                self._status_q.put_nowait(update)
+                return
+            except queue.Full:
+                try:
+                    self._status_q.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def _status_worker(self):
+        """Apply coalesced status updates to the tray icon"""
+        while True:
+            update = self._status_q.get()
+            if update is None:
+                return
+
+            status, message, disabled = update
+            try:
+                image = self.create_icon(status, disabled)
+                if self.icon.icon is not image:
+                    self.icon.icon = image
+
+                if message and self.config['ui']['show_notifications']:
+                    self.icon.notify(message, "TranscribeApp")
+            except Exception as e:
+                logger.error(f"Failed to apply tray status: {e}")
+
+            time.sleep(1.0 / self.STATUS_RATE_HZ)
+
     def on_record_click(self, icon, item):
         if self.callback_record:
             self.callback_record()
 
     def on_settings_click(self, icon, item):
+        # Settings is UI work: hand it to the Tk thread instead of running it
+        # on pystray's thread. Record and exit touch no widgets and stay direct
         if self.callback_settings:
-            self.callback_settings()
+            _run_on_tk(self.callback_settings)
 
     def on_exit_click(self, icon, item):
         if self.callback_exit:
             self.callback_exit()
         self.stop()
 
-    def setup_menu(self):
-        # Get AI status from config
+    def _ai_status_text(self, item) -> str:
         ai_enabled = self.config.get('llm', {}).get('enabled', True)
-        ai_status = "🤖 AI Enhancement: ON" if ai_enabled else "🔧 AI Enhancement: OFF"
+        return "🤖 AI Enhancement: ON" if ai_enabled else "🔧 AI Enhancement: OFF"
 
+    def setup_menu(self):
+        # The AI status text is read from config whenever the menu is shown,
+        # so one menu serves the whole session; call icon.update_menu() after
+        # a config change
         return pystray.Menu(
             pystray.MenuItem(
                 "🎤 Record (Ctrl+Shift+R)",
                 self.on_record_click,
                 default=True
             ),
-            pystray.MenuItem(ai_status, None, enabled=False),  # Status indicator (non-clickable)
+            pystray.MenuItem(self._ai_status_text, None, enabled=False),  # Status indicator (non-clickable)
             pystray.Menu.SEPARATOR,
             pystray.MenuItem("⚙️ Settings", self.on_settings_click),
             pystray.MenuItem("📋 History", self.show_history),
@@ -115,96 +488,28 @@ class TrayApp:
 
     def show_help(self, icon, item):
         """Show help dialog with usage instructions"""
-        def create_help_window():
-            help_window = tk.Tk()
-            help_window.withdraw()  # Hide the main window
-
-            help_text = """TranscribeApp - Quick Help Guide
-
-HOW TO USE:
-1. Click the system tray icon or press Ctrl+Shift+R to start recording
-2. Speak clearly in Spanish
-3. Stop speaking (3 seconds of silence ends recording)
-4. English translation appears automatically in active window
-
-KEYBOARD SHORTCUTS:
-• Ctrl+Shift+R - Start/Stop recording
-• Ctrl+Shift+T - Enable/Disable app
-
-REQUIREMENTS:
-• Qwen2.5-3B AI Model must be installed
-• Place model files in: C:\\Program Files\\TranscribeApp\\LLM\\Qwen2.5-3B-Instruct\\
-• Download from: https://huggingface.co/Qwen/Qwen2.5-3B-Instruct
-
-TIPS:
-• Speak clearly for best results
-• Wait for "Ready" status before recording
-• Processing takes ~3 seconds
-• Text is automatically typed where cursor is
-
-TROUBLESHOOTING:
-• "Model not found" - Download and install AI model
-• "CUDA error" - Update NVIDIA drivers
-• "Out of memory" - Close other applications
-• No text appearing - Check if cursor is in text field
-
-For more help, check README.txt in installation folder."""
-
-            messagebox.showinfo("TranscribeApp Help", help_text)
-            help_window.destroy()
-
-        # Run in thread to avoid blocking
-        threading.Thread(target=create_help_window, daemon=True).start()
         logger.info("Showing help dialog")
+        _show_info("TranscribeApp Help", _HELP_TEXT, owner=getattr(icon, '_hwnd', None))
 
     def show_about(self, icon, item):
         """Show about dialog with app information"""
-        def create_about_window():
-            about_window = tk.Tk()
-            about_window.withdraw()  # Hide the main window
-
-            about_text = """TranscribeApp v1.0
-
-AI-Powered Spanish to English Voice Translation
-
-Features:
-• Real-time Spanish speech recognition
-• AI-enhanced translation using Qwen2.5-3B
-• Automatic text injection into active window
-• System-wide hotkey support
-• Handles unclear speech intelligently
-
-System Requirements:
-• Windows 10/11 64-bit
-• NVIDIA GPU with CUDA support
-• 16GB RAM minimum
-• 10GB disk space
-
-© 2024 TranscribeApp
-Licensed under MIT License
-
-For support and documentation:
-Check README.txt in installation folder"""
-
-            messagebox.showinfo("About TranscribeApp", about_text)
-            about_window.destroy()
-
-        # Run in thread to avoid blocking
-        threading.Thread(target=create_about_window, daemon=True).start()
         logger.info("Showing about dialog")
+        _show_info("About TranscribeApp", _ABOUT_TEXT, owner=getattr(icon, '_hwnd', None))
 
     def run(self):
-        self.icon = pystray.Icon(
+        self.icon = TrayIcon(
             "TranscribeApp",
             self.create_icon(self.status),
-            menu=self.setup_menu()
+            menu=self._menu
         )
 
         threading.Thread(target=self.icon.run, daemon=True).start()
+        threading.Thread(target=self._status_worker, daemon=True).start()
         logger.info("System tray icon started")
 
     def stop(self):
         if self.icon:
+            self._post_status(None)
             self.icon.stop()
             logger.info("System tray icon stopped")
 
@@ -214,46 +519,103 @@ Check README.txt in installation folder"""
         self.callback_exit = exit_app
 
 
+@functools.lru_cache(maxsize=1)
+def _cached_audio_devices() -> tuple[tuple[dict, ...], tuple[str, ...]]:
+    """Enumerate input devices once per session; failures are not cached"""
+    devices = tuple(AudioRecorder.get_audio_devices())
+    return devices, tuple(f"{d['name']} (ID: {d['index']})" for d in devices)
+
+
+# Settings fields as (widget key, kind, label, config section, config option,
+# cast applied on save, widget options); checkboxes use the label as their text
+_AUDIO_FIELDS = [
+    ('sample_rate', 'combo', "Sample Rate:", 'audio', 'sample_rate', int,
+     {'values': ["16000", "22050", "44100", "48000"], 'width': 200}),
+    ('buffer_duration', 'slider', "Buffer Duration (seconds):", 'audio', 'buffer_duration', int,
+     {'from_': 10, 'to': 60, 'number_of_steps': 50, 'width': 400}),
+    ('silence_threshold', 'slider', "Silence Threshold:", 'audio', 'silence_threshold', float,
+     {'from_': 0.001, 'to': 0.1, 'number_of_steps': 99, 'width': 400}),
+    ('silence_duration', 'slider', "Silence Duration (seconds):", 'audio', 'silence_duration', float,
+     {'from_': 0.5, 'to': 5.0, 'number_of_steps': 45, 'width': 400}),
+]
+
+_MODEL_FIELDS = [
+    ('whisper_model', 'combo', "Whisper Model Size:", 'whisper', 'model_size', str,
+     {'values': ["tiny", "base", "small", "medium", "large"], 'width': 200}),
+    ('translation_model', 'entry', "Translation Model:", 'translation', 'model_name', str,
+     {'width': 400}),
+]
+
+_HOTKEY_FIELDS = [
+    ('record_hotkey', 'entry', "Record Hotkey:", 'hotkeys', 'record', str, {'width': 200}),
+    ('toggle_hotkey', 'entry', "Toggle Enable/Disable:", 'hotkeys', 'toggle_enabled', str, {'width': 200}),
+]
+
+_ADVANCED_FIELDS = [
+    ('show_notifications', 'check', "Show notifications", 'ui', 'show_notifications', None, {}),
+    ('model_cache', 'check', "Keep models in memory", 'performance', 'model_cache', None, {}),
+    ('max_recording', 'slider', "Max Recording Duration (seconds):", 'performance', 'max_recording_duration', int,
+     {'from_': 30, 'to': 300, 'number_of_steps': 27, 'width': 400}),
+]
+
+
 class SettingsWindow:
-    def __init__(self, config: dict, save_callback: Callable = None):
+    def __init__(self, config: dict, save_callback: Callable = None, master: tk.Misc = None):
         self.config = config
         self.save_callback = save_callback
+        self.master = master
         self.window = None
         self.widgets = {}
+        self._save_result = None
+        self._config_hash = None  # blake2b of config.json as last read/written
 
     def show(self):
+        """Open the window on the Tk thread; returns immediately"""
+        if threading.current_thread() is _tk_thread:
+            self._show()
+        else:
+            _run_on_tk(self._show)
+
+    def _show(self):
+        # After the first open the window is only withdrawn; bring it back
+        # with the current config instead of rebuilding every widget
         if self.window is not None and self.window.winfo_exists():
+            self._reload_values()
+            self.window.deiconify()
             self.window.lift()
+            self.window.focus_force()
             return
 
-        ctk.set_appearance_mode("dark")
-        ctk.set_default_color_theme("blue")
+        _load_ctk()
 
-        self.window = ctk.CTk()
+        # A Toplevel on the shared root avoids a second Tcl interpreter and
+        # a nested mainloop; the root's loop services this window
+        self.window = ctk.CTkToplevel(self.master or _get_tk_root())
         self.window.title("TranscribeApp Settings")
         self.window.geometry("600x700")
         self.window.resizable(False, False)
 
         self.create_widgets()
 
-        self.window.protocol("WM_DELETE_WINDOW", self.on_close)
-        self.window.mainloop()
+        self.window.protocol("WM_DELETE_WINDOW", self._hide)
+        self.window.lift()
+        self.window.focus_force()
 
     def create_widgets(self):
-        notebook = ctk.CTkTabview(self.window, width=580, height=650)
-        notebook.pack(padx=10, pady=10)
-
-        audio_tab = notebook.add("Audio")
-        self.create_audio_tab(audio_tab)
-
-        model_tab = notebook.add("Models")
-        self.create_model_tab(model_tab)
-
-        hotkey_tab = notebook.add("Hotkeys")
-        self.create_hotkey_tab(hotkey_tab)
-
-        advanced_tab = notebook.add("Advanced")
-        self.create_advanced_tab(advanced_tab)
+        self.notebook = ctk.CTkTabview(self.window, width=580, height=650, command=self._on_tab_change)
+        self.notebook.pack(padx=10, pady=10)
+
+        # Tabs are filled in on first activation; Audio is visible by default
+        self._tab_builders = {
+            "Audio": self.create_audio_tab,
+            "Models": self.create_model_tab,
+            "Hotkeys": self.create_hotkey_tab,
+            "Advanced": self.create_advanced_tab
+        }
+        self._tabs_built = set()
+        for name in self._tab_builders:
+            self.notebook.add(name)
+        self._on_tab_change("Audio")
 
         button_frame = ctk.CTkFrame(self.window)
         button_frame.pack(fill="x", padx=10, pady=(0, 10))
@@ -261,9 +623,15 @@ class SettingsWindow:
         save_btn = ctk.CTkButton(button_frame, text="Save", command=self.save_settings, width=100)
         save_btn.pack(side="right", padx=5)
 
-        cancel_btn = ctk.CTkButton(button_frame, text="Cancel", command=self.on_close, width=100)
+        cancel_btn = ctk.CTkButton(button_frame, text="Cancel", command=self._hide, width=100)
         cancel_btn.pack(side="right")
 
+    def _on_tab_change(self, name: str = None):
+        name = name or self.notebook.get()
+        if name not in self._tabs_built:
+            self._tabs_built.add(name)
+            self._tab_builders[name](self.notebook.tab(name))
+
     def create_audio_tab(self, parent):
         frame = ctk.CTkFrame(parent)
         frame.pack(fill="both", expand=True, padx=10, pady=10)
@@ -273,80 +641,55 @@ class SettingsWindow:
         # Microphone selection
         ctk.CTkLabel(frame, text="Input Device:").pack(anchor="w", padx=20, pady=(10, 0))
 
-        # Get available audio devices
-        try:
-            from audio_handler import AudioRecorder
-            devices = AudioRecorder.get_audio_devices()
-            device_names = [f"{d['name']} (ID: {d['index']})" for d in devices]
-            current_device = self.config['audio'].get('input_device', None)
-        except:
-            device_names = ["Default Device"]
-            current_device = None
-
-        self.widgets['input_device'] = ctk.CTkComboBox(
-            frame,
-            values=device_names if device_names else ["Default Device"],
-            width=400
-        )
-
-        if current_device is not None:
-            for i, d in enumerate(devices):
-                if d['index'] == current_device:
-                    self.widgets['input_device'].set(device_names[i])
-                    break
-        else:
-            self.widgets['input_device'].set("Default Device")
-
+        self.widgets['input_device'] = ctk.CTkComboBox(frame, values=["Default Device"], width=400)
         self.widgets['input_device'].pack(padx=20, pady=5)
+        self._load_devices()
 
-        ctk.CTkLabel(frame, text="Sample Rate:").pack(anchor="w", padx=20, pady=(10, 0))
-        self.widgets['sample_rate'] = ctk.CTkComboBox(
-            frame,
-            values=["16000", "22050", "44100", "48000"],
-            width=200
-        )
-        self.widgets['sample_rate'].set(str(self.config['audio']['sample_rate']))
-        self.widgets['sample_rate'].pack(padx=20, pady=5)
+        ctk.CTkButton(frame, text="Refresh Devices", command=self._refresh_devices, width=120).pack(padx=20, pady=5)
 
-        ctk.CTkLabel(frame, text="Buffer Duration (seconds):").pack(anchor="w", padx=20, pady=(10, 0))
-        self.widgets['buffer_duration'] = ctk.CTkSlider(
-            frame,
-            from_=10,
-            to=60,
-            number_of_steps=50,
-            width=400
-        )
-        self.widgets['buffer_duration'].set(self.config['audio']['buffer_duration'])
-        self.widgets['buffer_duration'].pack(padx=20, pady=5)
+        self._build_fields(frame, _AUDIO_FIELDS)
 
         self.buffer_label = ctk.CTkLabel(frame, text=f"Buffer: {self.config['audio']['buffer_duration']}s")
-        self.buffer_label.pack()
+        self.buffer_label.pack(after=self.widgets['buffer_duration'])
 
-        self.widgets['buffer_duration'].configure(
-            command=lambda v: self.buffer_label.configure(text=f"Buffer: {int(v)}s")
-        )
+        self._last_buf_int = int(self.config['audio']['buffer_duration'])
+        self.widgets['buffer_duration'].configure(command=self._on_buffer_change)
 
-        ctk.CTkLabel(frame, text="Silence Threshold:").pack(anchor="w", padx=20, pady=(10, 0))
-        self.widgets['silence_threshold'] = ctk.CTkSlider(
-            frame,
-            from_=0.001,
-            to=0.1,
-            number_of_steps=99,
-            width=400
-        )
-        self.widgets['silence_threshold'].set(self.config['audio']['silence_threshold'])
-        self.widgets['silence_threshold'].pack(padx=20, pady=5)
+    def _on_buffer_change(self, value):
+        # Fires for every slider step while dragging; only relabel when the
+        # whole-second value changes, and let Tk coalesce the redraw
+        seconds = int(value)
+        if seconds == self._last_buf_int:
+            return
+        self._last_buf_int = seconds
+        self.window.after_idle(lambda: self.buffer_label.configure(text=f"Buffer: {seconds}s"))
+
+    def _load_devices(self):
+        """Fill the input device combo from the (cached) device list"""
+        self._devices, self._device_names = (), ()
+        if _AUDIO_OK:
+            try:
+                self._devices, self._device_names = _cached_audio_devices()
+            except sounddevice.PortAudioError as e:
+                logger.warning(f"Could not list audio devices: {e}")
+        self._device_id_by_name = {
+            name: device['index'] for device, name in zip(self._devices, self._device_names)
+        }
 
-        ctk.CTkLabel(frame, text="Silence Duration (seconds):").pack(anchor="w", padx=20, pady=(10, 0))
-        self.widgets['silence_duration'] = ctk.CTkSlider(
-            frame,
-            from_=0.5,
-            to=5.0,
-            number_of_steps=45,
-            width=400
-        )
-        self.widgets['silence_duration'].set(self.config['audio']['silence_duration'])
-        self.widgets['silence_duration'].pack(padx=20, pady=5)
+        combo = self.widgets['input_device']
+        combo.configure(values=list(self._device_names) or ["Default Device"])
+
+        current_device = self.config['audio'].get('input_device', None)
+        for device, name in zip(self._devices, self._device_names):
+            if device['index'] == current_device:
+                combo.set(name)
+                break
+        else:
+            combo.set("Default Device")
+
+    def _refresh_devices(self):
+        _cached_audio_devices.cache_clear()
+        self._load_devices()
 
     def create_model_tab(self, parent):
         frame = ctk.CTkFrame(parent)
@@ -354,19 +697,7 @@ class SettingsWindow:
 
         ctk.CTkLabel(frame, text="Model Settings", font=("Arial", 16, "bold")).pack(pady=10)
 
-        ctk.CTkLabel(frame, text="Whisper Model Size:").pack(anchor="w", padx=20, pady=(10, 0))
-        self.widgets['whisper_model'] = ctk.CTkComboBox(
-            frame,
-            values=["tiny", "base", "small", "medium", "large"],
-            width=200
-        )
-        self.widgets['whisper_model'].set(self.config['whisper']['model_size'])
-        self.widgets['whisper_model'].pack(padx=20, pady=5)
-
-        ctk.CTkLabel(frame, text="Translation Model:").pack(anchor="w", padx=20, pady=(10, 0))
-        self.widgets['translation_model'] = ctk.CTkEntry(frame, width=400)
-        self.widgets['translation_model'].insert(0, self.config['translation']['model_name'])
-        self.widgets['translation_model'].pack(padx=20, pady=5)
+        self._build_fields(frame, _MODEL_FIELDS)
 
         # AI Enhancement Section
         ai_frame = ctk.CTkFrame(frame)
@@ -389,14 +720,16 @@ class SettingsWindow:
 
         ctk.CTkLabel(model_frame, text="LLM Model:").pack(anchor="w", pady=(5, 0))
 
-        # Scan for available models
-        from model_scanner import ModelScanner
-        scanner = ModelScanner("LLM")
-        available_models = scanner.scan_models()
+        # Use the scan started by TrayApp if it has finished, else scan now
+        available_models = _wait_prescanned(timeout=0.2)
+        if available_models is None:
+            from model_scanner import ModelScanner
+            available_models = ModelScanner("LLM").scan_models()
 
         # Create model dropdown
         model_options = []
         self.model_details = {}  # Store full model info
+        self._model_id_to_display = {}
 
         if available_models:
             for model in available_models:
@@ -405,6 +738,7 @@ class SettingsWindow:
                     display_name += " [Incomplete]"
                 model_options.append(display_name)
                 self.model_details[display_name] = model
+                self._model_id_to_display[model['id']] = display_name
         else:
             model_options = ["No models found - Add models to LLM folder"]
 
@@ -419,14 +753,8 @@ class SettingsWindow:
         current_model = self.config.get('llm', {}).get('model_path', 'LLM/Qwen2.5-3B-Instruct')
         current_model_name = os.path.basename(current_model)
 
-        # Find and select current model in dropdown
-        for display_name, details in self.model_details.items():
-            if details['id'] == current_model_name:
-                self.widgets['llm_model'].set(display_name)
-                break
-        else:
-            if model_options:
-                self.widgets['llm_model'].set(model_options[0])
+        # Select current model in dropdown
+        self.widgets['llm_model'].set(self._model_id_to_display.get(current_model_name, model_options[0]))
 
         self.widgets['llm_model'].pack(pady=5)
 
@@ -461,15 +789,9 @@ class SettingsWindow:
         self.widgets['enhance_translation'].pack(padx=20, pady=5)
 
         # Info label about AI enhancement
-        info_text = """When AI Enhancement is disabled:
-• Basic text cleaning will still work
-• Translations will be more literal
-• Processing will be faster
-• Less memory usage"""
-
         info_label = ctk.CTkLabel(
             ai_frame,
-            text=info_text,
+            text=_AI_INFO_TEXT,
             justify="left",
             font=("Arial", 10),
             text_color="gray"
@@ -491,20 +813,12 @@ class SettingsWindow:
 
         ctk.CTkLabel(frame, text="Hotkey Settings", font=("Arial", 16, "bold")).pack(pady=10)
 
-        ctk.CTkLabel(frame, text="Record Hotkey:").pack(anchor="w", padx=20, pady=(10, 0))
-        self.widgets['record_hotkey'] = ctk.CTkEntry(frame, width=200)
-        self.widgets['record_hotkey'].insert(0, self.config['hotkeys']['record'])
-        self.widgets['record_hotkey'].pack(padx=20, pady=5)
-
-        ctk.CTkLabel(frame, text="Toggle Enable/Disable:").pack(anchor="w", padx=20, pady=(10, 0))
-        self.widgets['toggle_hotkey'] = ctk.CTkEntry(frame, width=200)
-        self.widgets['toggle_hotkey'].insert(0, self.config['hotkeys']['toggle_enabled'])
-        self.widgets['toggle_hotkey'].pack(padx=20, pady=5)
+        self._build_fields(frame, _HOTKEY_FIELDS)
 
     def on_model_selected(self, selected_value):
         """Update model info when a model is selected"""
-        if hasattr(self, 'model_details') and selected_value in self.model_details:
-            model = self.model_details[selected_value]
+        model = getattr(self, 'model_details', {}).get(selected_value)
+        if model:
             info_text = f"""Provider: {model['provider']}
 Quality: {model['quality'].capitalize()} | Speed: {model['speed'].capitalize()}
 Memory Required: {model['memory_required_gb']}GB RAM
@@ -518,50 +832,7 @@ Memory Required: {model['memory_required_gb']}GB RAM
 
     def show_download_guide(self):
         """Show guide for downloading additional models"""
-        def create_download_window():
-            download_window = tk.Tk()
-            download_window.withdraw()
-
-            guide_text = """Model Download Guide
-
-RECOMMENDED MODELS:
-
-1. Llama 3.2 3B (Meta) - Best English fluency
-   • Download: https://huggingface.co/meta-llama/Llama-3.2-3B-Instruct
-   • Size: 6GB
-   • Place in: LLM/Llama-3.2-3B-Instruct/
-
-2. Llama 3.2 1B (Meta) - Lightweight option
-   • Download: https://huggingface.co/meta-llama/Llama-3.2-1B-Instruct
-   • Size: 2GB (saves 4GB vs Qwen)
-   • Place in: LLM/Llama-3.2-1B-Instruct/
-
-3. Phi 3.5 Mini (Microsoft) - Good balance
-   • Download: https://huggingface.co/microsoft/Phi-3.5-mini-instruct
-   • Size: 3GB
-   • Place in: LLM/Phi-3.5-mini-instruct/
-
-4. Gemma 2 2B (Google) - Efficient
-   • Download: https://huggingface.co/google/gemma-2-2b-it
-   • Size: 4GB
-   • Place in: LLM/gemma-2-2b-it/
-
-HOW TO DOWNLOAD:
-1. Click the HuggingFace link
-2. Click "Files and versions" tab
-3. Download ALL files to the model folder
-4. Restart TranscribeApp
-5. Select the model in Settings
-
-Using Git LFS (easier):
-git lfs install
-cd LLM
-git clone [huggingface-url]"""
-
-            messagebox.showinfo("Download Models", guide_text)
-            download_window.destroy()
-
-        threading.Thread(target=create_download_window, daemon=True).start()
+        _show_info("Download Models", _DOWNLOAD_GUIDE_TEXT, owner=self.window)
 
     def toggle_llm_options(self):
         """Enable/disable LLM-related options based on main toggle"""
@@ -588,85 +859,148 @@ git clone [huggingface-url]"""
 
         ctk.CTkLabel(frame, text="Advanced Settings", font=("Arial", 16, "bold")).pack(pady=10)
 
-        self.widgets['show_notifications'] = ctk.CTkCheckBox(
-            frame,
-            text="Show notifications"
-        )
-        if self.config['ui']['show_notifications']:
-            self.widgets['show_notifications'].select()
-        self.widgets['show_notifications'].pack(padx=20, pady=10)
+        self._build_fields(frame, _ADVANCED_FIELDS)
 
-        self.widgets['model_cache'] = ctk.CTkCheckBox(
-            frame,
-            text="Keep models in memory"
-        )
-        if self.config['performance']['model_cache']:
-            self.widgets['model_cache'].select()
-        self.widgets['model_cache'].pack(padx=20, pady=10)
+    def _build_fields(self, parent, fields):
+        """Create, pack and fill the widgets described by a field table"""
+        widget_types = {
+            'combo': ctk.CTkComboBox,
+            'slider': ctk.CTkSlider,
+            'entry': ctk.CTkEntry,
+            'check': ctk.CTkCheckBox
+        }
 
-        ctk.CTkLabel(frame, text="Max Recording Duration (seconds):").pack(anchor="w", padx=20, pady=(10, 0))
-        self.widgets['max_recording'] = ctk.CTkSlider(
-            frame,
-            from_=30,
-            to=300,
-            number_of_steps=27,
-            width=400
-        )
-        self.widgets['max_recording'].set(self.config['performance']['max_recording_duration'])
-        self.widgets['max_recording'].pack(padx=20, pady=5)
+        for key, kind, label, _section, _option, _cast, options in fields:
+            if kind == 'check':
+                widget = widget_types[kind](parent, text=label, **options)
+                widget.pack(padx=20, pady=10)
+            else:
+                ctk.CTkLabel(parent, text=label).pack(anchor="w", padx=20, pady=(10, 0))
+                widget = widget_types[kind](parent, **options)
+                widget.pack(padx=20, pady=5)
+            self.widgets[key] = widget
+
+        self._load_fields(fields)
+
+    def _load_fields(self, fields):
+        """Set the widgets of a field table from the current config"""
+        for key, kind, _label, section, option, _cast, _options in fields:
+            widget = self.widgets[key]
+            value = self.config[section][option]
+
+            if kind == 'check' and value:
+                widget.select()
+            elif kind == 'check':
+                widget.deselect()
+            elif kind == 'entry':
+                widget.delete(0, "end")
+                widget.insert(0, value)
+            elif kind == 'combo':
+                widget.set(str(value))
+            else:
+                widget.set(value)
+
+    def _store_fields(self, fields):
+        """Copy the values of built widgets back into the config"""
+        for key, _kind, _label, section, option, cast, _options in fields:
+            if key in self.widgets:
+                value = self.widgets[key].get()
+                self.config.setdefault(section, {})[option] = cast(value) if cast else value
 
     def save_settings(self):
+        if self._save_result is not None:
+            return  # previous save still writing
+
         try:
-            # Save audio device selection
-            selected_device = self.widgets['input_device'].get()
-            if "ID:" in selected_device:
-                device_id = int(selected_device.split("ID: ")[1].split(")")[0])
-                self.config['audio']['input_device'] = device_id
-            else:
-                self.config['audio']['input_device'] = None
+            audio, llm = (self.config.setdefault(section, {}) for section in ('audio', 'llm'))
 
-            self.config['audio']['sample_rate'] = int(self.widgets['sample_rate'].get())
-            self.config['audio']['buffer_duration'] = int(self.widgets['buffer_duration'].get())
-            self.config['audio']['silence_threshold'] = float(self.widgets['silence_threshold'].get())
-            self.config['audio']['silence_duration'] = float(self.widgets['silence_duration'].get())
+            # Save audio device selection
+            if 'input_device' in self.widgets:
+                audio['input_device'] = self._device_id_by_name.get(self.widgets['input_device'].get())
 
-            self.config['whisper']['model_size'] = self.widgets['whisper_model'].get()
-            self.config['translation']['model_name'] = self.widgets['translation_model'].get()
+            self._store_fields(_AUDIO_FIELDS + _MODEL_FIELDS + _HOTKEY_FIELDS + _ADVANCED_FIELDS)
 
-            # Save LLM settings
-            if 'llm' not in self.config:
-                self.config['llm'] = {}
-            self.config['llm']['enabled'] = self.widgets['llm_enabled'].get()
-            self.config['llm']['enhance_translation'] = self.widgets['enhance_translation'].get()
+            # Save LLM settings (only if the Models tab was opened)
+            if 'llm_enabled' in self.widgets:
+                llm['enabled'] = self.widgets['llm_enabled'].get()
+                llm['enhance_translation'] = self.widgets['enhance_translation'].get()
 
             # Save selected model
             if 'llm_model' in self.widgets:
-                selected_model = self.widgets['llm_model'].get()
-                if hasattr(self, 'model_details') and selected_model in self.model_details:
-                    model_info = self.model_details[selected_model]
-                    self.config['llm']['model_path'] = model_info['path']
-                    self.config['llm']['model_id'] = model_info['id']
+                model_info = getattr(self, 'model_details', {}).get(self.widgets['llm_model'].get())
+                if model_info:
+                    llm['model_path'] = model_info['path']
+                    llm['model_id'] = model_info['id']
+
+            # Serialize here, write on a worker so a slow disk never stalls
+            # the UI; _poll_save picks up the outcome
+            payload = json.dumps(self.config, indent=4, separators=(',', ': ')).encode('utf-8')
+            self._save_result = queue.Queue(maxsize=1)
+            threading.Thread(target=self._write_config, args=(payload, self._save_result), daemon=True).start()
+            self.window.after(50, self._poll_save)
+
+        except Exception as e:
+            logger.error(f"Failed to save settings: {e}")
 
-            self.config['hotkeys']['record'] = self.widgets['record_hotkey'].get()
-            self.config['hotkeys']['toggle_enabled'] = self.widgets['toggle_hotkey'].get()
+    def _write_config(self, payload: bytes, result: queue.Queue):
+        try:
+            digest = hashlib.blake2b(payload).digest()
+            if self._config_hash is None and os.path.exists('config.json'):
+                with open('config.json', 'rb') as f:
+                    self._config_hash = hashlib.blake2b(f.read()).digest()
 
-            self.config['ui']['show_notifications'] = self.widgets['show_notifications'].get()
-            self.config['performance']['model_cache'] = self.widgets['model_cache'].get()
-            self.config['performance']['max_recording_duration'] = int(self.widgets['max_recording'].get())
+            if digest == self._config_hash:
+                logger.debug("Settings unchanged, skipping config write")
+            else:
+                _atomic_write('config.json', payload)
+                self._config_hash = digest
+            result.put(None)
+        except Exception as e:
+            result.put(e)
 
-            with open('config.json', 'w') as f:
-                json.dump(self.config, f, indent=4)
+    def _poll_save(self):
+        try:
+            error = self._save_result.get_nowait()
+        except queue.Empty:
+            self.window.after(50, self._poll_save)
+            return
 
-            if self.save_callback:
-                self.save_callback(self.config)
+        self._save_result = None
+        if error is not None:
+            logger.error(f"Failed to save settings: {error}")
+            return
 
-            logger.info("Settings saved successfully")
-            self.on_close()
+        if self.save_callback:
+            self.save_callback(self.config)
 
-        except Exception as e:
-            logger.error(f"Failed to save settings: {e}")
+        logger.info("Settings saved successfully")
+        self._hide()
 
-    def on_close(self):
+    def _hide(self):
         if self.window:
-            self.window.destroy()
-            self.window = None
\ No newline at end of file
+            self.window.withdraw()
+
+    def _reload_values(self):
+        """Refresh the widgets of every built tab from self.config"""
+        for name, fields in (("Audio", _AUDIO_FIELDS), ("Models", _MODEL_FIELDS),
+                             ("Hotkeys", _HOTKEY_FIELDS), ("Advanced", _ADVANCED_FIELDS)):
+            if name in self._tabs_built:
+                self._load_fields(fields)
+
+        if "Audio" in self._tabs_built:
+            self._load_devices()
+            self._last_buf_int = int(self.config['audio']['buffer_duration'])
+            self.buffer_label.configure(text=f"Buffer: {self._last_buf_int}s")
+
+        if "Models" in self._tabs_built:
+            llm = self.config.get('llm', {})
+            for key, option in (('llm_enabled', 'enabled'), ('enhance_translation', 'enhance_translation')):
+                if llm.get(option, True):
+                    self.widgets[key].select()
+                else:
+                    self.widgets[key].deselect()
+            current_model_name = os.path.basename(llm.get('model_path', 'LLM/Qwen2.5-3B-Instruct'))
+            if current_model_name in self._model_id_to_display:
+                self.widgets['llm_model'].set(self._model_id_to_display[current_model_name])
+                self.on_model_selected(self.widgets['llm_model'].get())
+            self.toggle_llm_options()
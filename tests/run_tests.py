@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+"""
+Run the automated test scripts in parallel
+Each script runs in its own process; output is shown per script once it finishes
+"""
+
+import sys
+import os
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(TESTS_DIR)
+
+# Non-interactive scripts only (test_whatsapp_fix.py waits for user input)
+TEST_SCRIPTS = [
+    "test_technical_terms.py",
+    "test_tray_icons.py",
+    "test_qwen_cache.py",
+    "test_qwen_fix.py",
+]
+
+
+def run_script(script):
+    """Run one test script from the project root and capture its output"""
+    start = time.time()
+    proc = subprocess.run(
+        [sys.executable, os.path.join(TESTS_DIR, script)],
+        cwd=ROOT_DIR,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        encoding="utf-8",
+        errors="replace"
+    )
+    return script, proc.returncode, proc.stdout, time.time() - start
+
+
+def main():
+    scripts = sys.argv[1:] or TEST_SCRIPTS
+
+    with ThreadPoolExecutor(max_workers=len(scripts)) as pool:
+        results = list(pool.map(run_script, scripts))
+
+    for script, returncode, output, elapsed in results:
+        print("\n" + "="*70)
+        print(f"  {script}  ({elapsed:.1f}s)")
+        print("="*70)
+        print(output)
+
+    print("\n" + "="*70)
+    print("                        TEST SUMMARY")
+    print("="*70)
+
+    for script, returncode, _, elapsed in results:
+        status = "✅ PASSED" if returncode == 0 else "❌ FAILED"
+        print(f"{script:25} {status}  ({elapsed:.1f}s)")
+
+    print("="*70)
+    return all(returncode == 0 for _, returncode, _, _ in results)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+"""
+Test script for the Qwen output cache
+Uses a fake model, so it runs without torch or the LLM weights
+"""
+
+import sys
+import os
+import tempfile
+# Add parent directory to path to import src modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.qwen_cache import QwenCache, cache_processor, NO_CACHE_ENV
+
+
+class FakeTensor:
+    """The bits of torch.Tensor the cache touches"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def tolist(self):
+        return self.rows
+
+    def new_tensor(self, rows):
+        return FakeTensor(rows)
+
+
+class FakeModel:
+    """Appends a fixed token to every row and counts real generate calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, **kwargs):
+        self.calls += 1
+        return FakeTensor([row + [99] for row in kwargs['input_ids'].tolist()])
+
+
+class FakeProcessor:
+    current_model_id = "fake-model"
+    device = "cpu"
+
+    def __init__(self):
+        self.model = None
+        self.is_initialized = False
+
+    def initialize(self):
+        self.model = FakeModel()
+        self.is_initialized = True
+        return True
+
+
+def _generate(processor, ids, max_new_tokens=10):
+    return processor.model.generate(
+        input_ids=FakeTensor(ids),
+        attention_mask=FakeTensor([[1] * len(row) for row in ids]),
+        max_new_tokens=max_new_tokens,
+        do_sample=False
+    )
+
+
+def test_cache_hits_and_misses():
+    """A repeated identical input must be served from sqlite, anything else must miss"""
+    print("\n" + "="*60)
+    print("Testing Qwen Output Cache")
+    print("="*60)
+
+    # This test is about the cache itself, so ignore an opt-out in the shell
+    os.environ.pop(NO_CACHE_ENV, None)
+
+    checks = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "qwen_cache.db")
+
+        # First process: the input is new, so the model runs and the result is stored
+        first = FakeProcessor()
+        cache = QwenCache(path)
+        cache_processor(first, cache)
+        first.initialize()
+        output = _generate(first, [[1, 2, 3]])
+        checks.append(("first call runs the model", first.model.calls == 1 and cache.misses == 1))
+        checks.append(("output returned unchanged", output.tolist() == [[1, 2, 3, 99]]))
+        cache.close()
+
+        # Second process: fresh memory, same sqlite file
+        second = FakeProcessor()
+        cache = QwenCache(path)
+        cache_processor(second, cache)
+        second.initialize()
+        output = _generate(second, [[1, 2, 3]])
+        checks.append(("repeat is served from sqlite", second.model.calls == 0 and cache.hits == 1))
+        checks.append(("cached output matches", output.tolist() == [[1, 2, 3, 99]]))
+
+        _generate(second, [[1, 2, 3]], max_new_tokens=20)
+        checks.append(("other generation settings miss", second.model.calls == 1))
+
+        _generate(second, [[1, 2, 3], [0, 4, 5]])
+        checks.append(("a batch containing the same prompt misses", second.model.calls == 2))
+        cache.close()
+
+    for name, ok in checks:
+        print(f"{'✅' if ok else '❌'} {name}")
+
+    passed = sum(ok for _, ok in checks)
+    print(f"\nResults: {passed}/{len(checks)} passed")
+    return passed == len(checks)
+
+
+def main():
+    print("\n" + "="*70)
+    print("          QWEN OUTPUT CACHE TEST")
+    print("="*70)
+
+    passed = test_cache_hits_and_misses()
+
+    print("\n" + "="*70)
+    print("✅ PASSED" if passed else "❌ FAILED")
+    print("="*70)
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
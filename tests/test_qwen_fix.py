@@ -10,7 +10,9 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import logging
-from src.qwen_processor import get_qwen_processor
+# Cached generations: re-runs on the same fixtures skip generate()
+from src.qwen_cache import get_cached_qwen_processor as get_qwen_processor
+from src.qwen_processor import CLEANING_SYSTEM_PROMPT, ENHANCE_SYSTEM_PROMPT
 from src.model_manager import ModelManager
 import json
 
@@ -20,18 +22,134 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+# Load config from parent directory once per run
+_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config.json')
+with open(_CONFIG_PATH, 'r') as f:
+    _CONFIG = json.load(f)
+
+# Common Spanish words that should not survive into an English translation
+_SPANISH_MARKERS = frozenset({'que', 'por', 'esta', 'pero', 'como'})
+
+
+def _has_duplicate(text, needle, times=1):
+    """True if needle occurs more than `times` times (non-overlapping), stopping at the first extra hit"""
+    if not needle:
+        return len(text) + 1 > times
+    start = 0
+    for _ in range(times + 1):
+        index = text.find(needle, start)
+        if index == -1:
+            return False
+        start = index + len(needle)
+    return True
+
+
+def _first_word_repeats(text, after=20):
+    """True if the text's first word shows up again from offset `after` on"""
+    space = text.find(' ')
+    return space > 0 and text.find(text[:space], after) != -1
+
+
+# Loaded once per run and shared by all tests
+_qwen = None
+_manager = None
+
+# Prompts per _generate_batch call, recorded to check the batch path ran
+_BATCH_SIZES = []
+
+
+def _record_batches(processor):
+    """Wrap the processor's _generate_batch to record the size of each successful call"""
+    generate_batch = processor._generate_batch
+
+    def recording(prompts, *args, **kwargs):
+        # Recorded after the call: a batch that raised (and fell back to the
+        # inputs) must not count
+        responses = generate_batch(prompts, *args, **kwargs)
+        _BATCH_SIZES.append(len(prompts))
+        return responses
+
+    processor._generate_batch = recording
+
+
+def shared_qwen():
+    """Initialize the Qwen processor on first use; None if it cannot load"""
+    global _qwen
+    if _qwen is None:
+        processor = get_qwen_processor()
+        print("\nInitializing Qwen processor...")
+        if not processor.initialize():
+            print("❌ Failed to initialize Qwen processor")
+            return None
+        _record_batches(processor)
+        _qwen = processor
+    return _qwen
+
+
+def shared_manager():
+    """Initialize a ModelManager once, running its pipeline on the shared Qwen instead of a second LLM"""
+    global _manager
+    if _manager is None:
+        # The app's own LLM (UniversalLLMProcessor) is not loaded here: this
+        # script verifies QwenProcessor, and one LLM per run is enough
+        config = dict(_CONFIG, llm=dict(_CONFIG.get('llm', {}), enabled=False))
+        manager = ModelManager(config)
+
+        print("\nInitializing models...")
+        if not manager.initialize_models():
+            print("❌ Failed to initialize models")
+            return None
+        manager.qwen_processor = shared_qwen()
+        _manager = manager
+    return _manager
+
+
+def test_prompt_tokens():
+    """Cached template ids around the user text must equal tokenizing the whole chat template"""
+    print("\n" + "="*60)
+    print("Testing Prompt Tokenization")
+    print("="*60)
+
+    processor = shared_qwen()
+    if processor is None:
+        return False
+
+    spanish = "este eh mmm hola como estas"
+    english = "hello how are you"
+    cases = [
+        ("Cleaning prompt", processor._cleaning_prompt(spanish), CLEANING_SYSTEM_PROMPT, spanish),
+        ("Enhancement prompt", processor._enhance_prompt(spanish, english), ENHANCE_SYSTEM_PROMPT,
+         f"Spanish: {spanish}\nEnglish: {english}\nImproved English:"),
+    ]
+
+    all_passed = True
+    for name, ids, system, user in cases:
+        expected = processor.tokenizer.apply_chat_template(
+            [{"role": "system", "content": system}, {"role": "user", "content": user}],
+            tokenize=True,
+            add_generation_prompt=True
+        )
+        ok = list(ids) == list(expected)
+        print(f"{'✅' if ok else '❌'} {name}: {len(ids)} ids vs {len(expected)} from apply_chat_template")
+        all_passed = all_passed and ok
+
+    # Over-long input: only the user text is cut, the assistant turn survives
+    _, suffix = processor._get_template_ids(CLEANING_SYSTEM_PROMPT)
+    ids = processor._cleaning_prompt("hola " * 500)
+    ok = len(ids) == 256 and ids[-len(suffix):] == suffix
+    print(f"{'✅' if ok else '❌'} Long input truncated to 256 ids, ending with the assistant turn")
+
+    return all_passed and ok
+
+
 def test_qwen_cleaning():
     """Test Spanish text cleaning"""
     print("\n" + "="*60)
     print("Testing Qwen Spanish Text Cleaning")
     print("="*60)
 
-    processor = get_qwen_processor()
-
-    # Initialize processor
-    print("\nInitializing Qwen processor...")
-    if not processor.initialize():
-        print("❌ Failed to initialize Qwen processor")
+    processor = shared_qwen()
+    if processor is None:
         return False
 
     # Test cases for Spanish cleaning
@@ -46,12 +164,17 @@ def test_qwen_cleaning():
     print("\nTesting Spanish text cleaning:")
     print("-" * 40)
 
+    # One batched generate for all cases
+    batches_before = len(_BATCH_SIZES)
+    cleaned_list = processor.clean_spanish_text_batch([text for text, _ in test_cases])
+
     all_passed = True
-    for spanish_text, description in test_cases:
+    if _BATCH_SIZES[batches_before:] != [len(test_cases)]:
+        print(f"❌ FAILED: expected one batch of {len(test_cases)}, got {_BATCH_SIZES[batches_before:]}")
+        all_passed = False
+    for (spanish_text, description), cleaned in zip(test_cases, cleaned_list):
         print(f"\nTest: {description}")
         print(f"Input:  '{spanish_text}'")
-
-        cleaned = processor.clean_spanish_text(spanish_text)
         print(f"Output: '{cleaned}'")
 
         # Check for issues
@@ -60,7 +183,7 @@ def test_qwen_cleaning():
             issues.append("Contains 'assistant' role marker")
         if '\nassistant\n' in cleaned:
             issues.append("Contains newline with assistant")
-        if cleaned.count(spanish_text[:10]) > 1:
+        if _has_duplicate(cleaned, spanish_text[:10]):
             issues.append("Text appears duplicated")
 
         if issues:
@@ -78,13 +201,9 @@ def test_translation_enhancement():
     print("Testing Translation Enhancement")
     print("="*60)
 
-    processor = get_qwen_processor()
-
-    if not processor.is_initialized:
-        print("\nInitializing Qwen processor...")
-        if not processor.initialize():
-            print("❌ Failed to initialize Qwen processor")
-            return False
+    processor = shared_qwen()
+    if processor is None:
+        return False
 
     # Test cases for enhancement
     test_cases = [
@@ -108,25 +227,30 @@ def test_translation_enhancement():
     print("\nTesting translation enhancement:")
     print("-" * 40)
 
+    # One batched generate for all cases
+    batches_before = len(_BATCH_SIZES)
+    enhanced_list = processor.enhance_translation_batch([(spanish, english) for spanish, english, _ in test_cases])
+
     all_passed = True
-    for spanish, english, description in test_cases:
+    if _BATCH_SIZES[batches_before:] != [len(test_cases)]:
+        print(f"❌ FAILED: expected one batch of {len(test_cases)}, got {_BATCH_SIZES[batches_before:]}")
+        all_passed = False
+    for (spanish, english, description), enhanced in zip(test_cases, enhanced_list):
         print(f"\nTest: {description}")
         print(f"Spanish:  '{spanish}'")
         print(f"English:  '{english}'")
-
-        enhanced = processor.enhance_translation(spanish, english)
         print(f"Enhanced: '{enhanced}'")
 
         # Check for issues
+        lowered = enhanced.lower()
         issues = []
-        if 'assistant' in enhanced.lower():
+        if 'assistant' in lowered:
             issues.append("Contains 'assistant' role marker")
-        if enhanced.count(english.split()[0]) > 2:
+        if _has_duplicate(enhanced, english.split()[0], times=2):
             issues.append("Possible duplication")
 
         # Check if it's still in English
-        spanish_words = ['que', 'por', 'esta', 'pero', 'como']
-        if any(word in enhanced.lower().split() for word in spanish_words):
+        if _SPANISH_MARKERS & set(lowered.split()):
             issues.append("Contains Spanish words")
 
         if issues:
@@ -144,17 +268,13 @@ def test_full_pipeline():
     print("Testing Full Pipeline")
     print("="*60)
 
-    # Load config from parent directory
-    config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config.json')
-    with open(config_path, 'r') as f:
-        config = json.load(f)
-
-    # Create model manager
-    manager = ModelManager(config)
+    manager = shared_manager()
+    if manager is None:
+        return False
 
-    print("\nInitializing models...")
-    if not manager.initialize_models():
-        print("❌ Failed to initialize models")
+    # The pipeline must run on the instance the cleaning tests loaded, not a second LLM
+    if manager.qwen_processor is not shared_qwen():
+        print("❌ FAILED: pipeline is not using the shared Qwen processor")
         return False
 
     # Simulate transcription results
@@ -187,7 +307,7 @@ def test_full_pipeline():
         # Check for issues
         if 'assistant' in translated.lower():
             print("❌ ISSUE: Contains 'assistant' in final output!")
-        elif translated.count(' ') > 0 and translated.split()[0] in translated[20:]:
+        elif _first_word_repeats(translated):
             print("❌ ISSUE: Possible text duplication!")
         else:
             print("✅ No issues detected")
@@ -204,13 +324,16 @@ def main():
     results = []
 
     # Run tests
-    print("\n[1/3] Testing Spanish text cleaning...")
+    print("\n[1/4] Testing prompt tokenization...")
+    results.append(("Prompt Tokenization", test_prompt_tokens()))
+
+    print("\n[2/4] Testing Spanish text cleaning...")
     results.append(("Spanish Cleaning", test_qwen_cleaning()))
 
-    print("\n[2/3] Testing translation enhancement...")
+    print("\n[3/4] Testing translation enhancement...")
     results.append(("Translation Enhancement", test_translation_enhancement()))
 
-    print("\n[3/3] Testing full pipeline...")
+    print("\n[4/4] Testing full pipeline...")
     results.append(("Full Pipeline", test_full_pipeline()))
 
     # Summary
@@ -230,7 +353,8 @@ def main():
         print("\n⚠️  Some tests failed. Please check the output above.")
 
     print("\n" + "="*70)
+    return all_passed
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(0 if main() else 1)
\ No newline at end of file
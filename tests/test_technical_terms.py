@@ -6,10 +6,11 @@ Tests common programming terms misheard in Spanish context
 
 import sys
 import os
+import io
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.technical_terms import TechnicalTermsProcessor, process_technical_terms
+from src.technical_terms import get_technical_processor, process_technical_terms
 import logging
 
 # Configure logging
@@ -20,11 +21,13 @@ logging.basicConfig(
 
 def test_basic_corrections():
     """Test basic technical term corrections"""
-    print("\n" + "="*60)
-    print("Testing Basic Technical Term Corrections")
-    print("="*60)
+    # Collect output and write it once per test; per-line console flushes are slow on Windows
+    out = io.StringIO()
+    print("\n" + "="*60, file=out)
+    print("Testing Basic Technical Term Corrections", file=out)
+    print("="*60, file=out)
 
-    processor = TechnicalTermsProcessor()
+    processor = get_technical_processor()
 
     test_cases = [
         # (input, expected output, description)
@@ -40,8 +43,8 @@ def test_basic_corrections():
         ("archivo requaierments.txt", "archivo requirements.txt", "requirements file"),
     ]
 
-    print("\nBasic corrections:")
-    print("-" * 40)
+    print("\nBasic corrections:", file=out)
+    print("-" * 40, file=out)
 
     all_passed = True
     for input_text, expected, description in test_cases:
@@ -50,22 +53,25 @@ def test_basic_corrections():
         passed = result == expected
         status = "✅" if passed else "❌"
 
-        print(f"\n{description}:")
-        print(f"  Input:    '{input_text}'")
-        print(f"  Expected: '{expected}'")
-        print(f"  Result:   '{result}' {status}")
+        print(f"\n{description}:", file=out)
+        print(f"  Input:    '{input_text}'", file=out)
+        print(f"  Expected: '{expected}'", file=out)
+        print(f"  Result:   '{result}' {status}", file=out)
 
         if not passed:
             all_passed = False
 
+    sys.stdout.write(out.getvalue())
+    sys.stdout.flush()
     return all_passed
 
 
 def test_contextual_corrections():
     """Test corrections in context"""
-    print("\n" + "="*60)
-    print("Testing Contextual Corrections")
-    print("="*60)
+    out = io.StringIO()
+    print("\n" + "="*60, file=out)
+    print("Testing Contextual Corrections", file=out)
+    print("="*60, file=out)
 
     test_cases = [
         (
@@ -90,8 +96,8 @@ def test_contextual_corrections():
         ),
     ]
 
-    print("\nContextual corrections:")
-    print("-" * 40)
+    print("\nContextual corrections:", file=out)
+    print("-" * 40, file=out)
 
     all_passed = True
     for input_text, expected, description in test_cases:
@@ -100,22 +106,25 @@ def test_contextual_corrections():
         passed = result == expected
         status = "✅" if passed else "❌"
 
-        print(f"\n{description}:")
-        print(f"  Input:    '{input_text}'")
-        print(f"  Expected: '{expected}'")
-        print(f"  Result:   '{result}' {status}")
+        print(f"\n{description}:", file=out)
+        print(f"  Input:    '{input_text}'", file=out)
+        print(f"  Expected: '{expected}'", file=out)
+        print(f"  Result:   '{result}' {status}", file=out)
 
         if not passed:
             all_passed = False
 
+    sys.stdout.write(out.getvalue())
+    sys.stdout.flush()
     return all_passed
 
 
 def test_real_world_examples():
     """Test with real transcription examples"""
-    print("\n" + "="*60)
-    print("Testing Real-World Transcription Examples")
-    print("="*60)
+    out = io.StringIO()
+    print("\n" + "="*60, file=out)
+    print("Testing Real-World Transcription Examples", file=out)
+    print("="*60, file=out)
 
     examples = [
         (
@@ -145,8 +154,8 @@ def test_real_world_examples():
         ),
     ]
 
-    print("\nReal-world examples:")
-    print("-" * 40)
+    print("\nReal-world examples:", file=out)
+    print("-" * 40, file=out)
 
     all_passed = True
     for input_text, expected, description in examples:
@@ -155,24 +164,27 @@ def test_real_world_examples():
         passed = result == expected
         status = "✅" if passed else "❌"
 
-        print(f"\n{description}:")
-        print(f"  Input:    '{input_text}'")
-        print(f"  Expected: '{expected}'")
-        print(f"  Result:   '{result}' {status}")
+        print(f"\n{description}:", file=out)
+        print(f"  Input:    '{input_text}'", file=out)
+        print(f"  Expected: '{expected}'", file=out)
+        print(f"  Result:   '{result}' {status}", file=out)
 
         if not passed:
             all_passed = False
 
+    sys.stdout.write(out.getvalue())
+    sys.stdout.flush()
     return all_passed
 
 
 def test_code_context_detection():
     """Test detection of code/technical context"""
-    print("\n" + "="*60)
-    print("Testing Code Context Detection")
-    print("="*60)
+    out = io.StringIO()
+    print("\n" + "="*60, file=out)
+    print("Testing Code Context Detection", file=out)
+    print("="*60, file=out)
 
-    processor = TechnicalTermsProcessor()
+    processor = get_technical_processor()
 
     test_cases = [
         ("vamos a escribir código", True, "Spanish code mention"),
@@ -184,8 +196,8 @@ def test_code_context_detection():
         ("ejecutar el comando", True, "Command mention"),
     ]
 
-    print("\nCode context detection:")
-    print("-" * 40)
+    print("\nCode context detection:", file=out)
+    print("-" * 40, file=out)
 
     all_passed = True
     for text, expected, description in test_cases:
@@ -194,14 +206,16 @@ def test_code_context_detection():
         passed = result == expected
         status = "✅" if passed else "❌"
 
-        print(f"\n{description}:")
-        print(f"  Text:     '{text}'")
-        print(f"  Expected: {expected}")
-        print(f"  Result:   {result} {status}")
+        print(f"\n{description}:", file=out)
+        print(f"  Text:     '{text}'", file=out)
+        print(f"  Expected: {expected}", file=out)
+        print(f"  Result:   {result} {status}", file=out)
 
         if not passed:
             all_passed = False
 
+    sys.stdout.write(out.getvalue())
+    sys.stdout.flush()
     return all_passed
 
 
@@ -248,7 +262,8 @@ def main():
         print("\n⚠️  Some tests failed. Please check the output above.")
 
     print("\n" + "="*70)
+    return all_passed
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(0 if main() else 1)
\ No newline at end of file
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+"""
+Test script for the tray icon cache
+Verifies that every status update hands pystray the same shared image
+"""
+
+import sys
+import os
+# Add src directory to path (ui_manager imports its siblings directly)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from ui_manager import TrayApp, _ICONS, _icon_key
+
+
+def test_icon_identity():
+    """Repeated create_icon calls must return the cached instance, not a copy"""
+    print("\n" + "="*60)
+    print("Testing Tray Icon Cache Identity")
+    print("="*60)
+
+    tray = TrayApp({'llm': {'enabled': True}, 'ui': {'show_notifications': False}})
+
+    cases = [
+        ('ready', False),
+        ('recording', False),
+        ('processing', False),
+        ('success', False),
+        ('error', False),
+        ('recording', True),
+        ('disabled', True),
+    ]
+
+    passed = 0
+    for status, disabled in cases:
+        first = tray.create_icon(status, disabled)
+        second = tray.create_icon(status, disabled)
+        ok = id(first) == id(second) and first is _ICONS[_icon_key(status, disabled)]
+        print(f"{'✅' if ok else '❌'} {status:12} disabled={disabled}")
+        passed += ok
+
+    print(f"\nResults: {passed}/{len(cases)} passed")
+    return passed == len(cases)
+
+
+def main():
+    print("\n" + "="*70)
+    print("          TRAY ICON CACHE TEST")
+    print("="*70)
+
+    passed = test_icon_identity()
+
+    print("\n" + "="*70)
+    print("✅ PASSED" if passed else "❌ FAILED")
+    print("="*70)
+    return passed
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -2,6 +2,8 @@
 """
 Test script to verify WhatsApp text injection fix
 Run this while WhatsApp Desktop is open with a chat selected
+Set TRANSCRIBEAPP_AUTO=1 (or pass --auto) to skip the prompts and run the test
+for the focused app (WhatsApp or Notepad); the exit code reports the result
 """
 
 import sys
@@ -12,6 +14,8 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.text_injector import TextInjector
 import time
 import logging
+import ctypes
+from ctypes import wintypes
 
 # Configure logging
 logging.basicConfig(
@@ -19,8 +23,20 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+# Non-interactive mode: fixed waits instead of Enter prompts
+AUTO = os.environ.get("TRANSCRIBEAPP_AUTO") == "1" or "--auto" in sys.argv[1:]
+# Long enough for WhatsApp to finish handling a paste before the next key
+AUTO_SETTLE = 0.5
+
+def wait_for_user():
+    """Wait for Enter, or just let the target app settle in auto mode"""
+    if AUTO:
+        time.sleep(AUTO_SETTLE)
+    else:
+        input()
+
 def test_whatsapp_injection():
-    """Test text injection to WhatsApp"""
+    """Test text injection to WhatsApp; True if every injection succeeded"""
     injector = TextInjector()
 
     print("\n=== WhatsApp Text Injection Test ===")
@@ -28,7 +44,7 @@ def test_whatsapp_injection():
     print("2. Click on any chat")
     print("3. Click in the message input field")
     print("4. Press Enter to start test...")
-    input()
+    wait_for_user()
 
     # Check if WhatsApp is active
     hwnd, window_title = injector.get_active_window()
@@ -40,7 +56,7 @@ def test_whatsapp_injection():
     if active_app != 'whatsapp':
         print("\n⚠️  WhatsApp is not the active window!")
         print("Please click on WhatsApp and try again.")
-        return
+        return False
 
     # Test messages
     test_messages = [
@@ -49,6 +65,7 @@ def test_whatsapp_injection():
         "Test 3: ¿Hola cómo estás? Testing special characters",
     ]
 
+    all_passed = True
     for i, message in enumerate(test_messages, 1):
         print(f"\n--- Test {i}/3 ---")
         print(f"Injecting: {message}")
@@ -61,10 +78,11 @@ def test_whatsapp_injection():
             print("Check WhatsApp - is the text correct and NOT duplicated?")
         else:
             print("❌ Injection failed")
+            all_passed = False
 
         if i < len(test_messages):
             print("\nPress Enter to send and continue to next test...")
-            input()
+            wait_for_user()
             # Send the message (Enter key)
             injector._send_key(0x0D)  # VK_RETURN
             time.sleep(1)
@@ -72,42 +90,137 @@ def test_whatsapp_injection():
     print("\n=== Test Complete ===")
     print("If text appeared correctly without duplication, the fix is working!")
     print("\nKnown issues and solutions:")
-    print("- If still duplicating: Try increasing delays in _inject_whatsapp_safe()")
+    print("- If still duplicating: Try raising the _wait_clipboard_change() timeout in TextInjector._clip_set()")
     print("- If not appearing: Check if WhatsApp has focus")
     print("- If partial text: WhatsApp may be processing too slowly")
+    return all_passed
+
+# Reading the focused control's text (winuser.h)
+WM_GETTEXT = 0x000D
+WM_GETTEXTLENGTH = 0x000E
+SMTO_ABORTIFHUNG = 0x0002
+
+
+class GUITHREADINFO(ctypes.Structure):
+    _fields_ = [
+        ("cbSize", wintypes.DWORD),
+        ("flags", wintypes.DWORD),
+        ("hwndActive", wintypes.HWND),
+        ("hwndFocus", wintypes.HWND),
+        ("hwndCapture", wintypes.HWND),
+        ("hwndMenuOwner", wintypes.HWND),
+        ("hwndMoveSize", wintypes.HWND),
+        ("hwndCaret", wintypes.HWND),
+        ("rcCaret", wintypes.RECT),
+    ]
+
+
+def _target_user32():
+    """Private user32 handle with the prototypes used to read the target control"""
+    user32 = ctypes.WinDLL('user32', use_last_error=True)
+    user32.GetGUIThreadInfo.argtypes = [wintypes.DWORD, ctypes.POINTER(GUITHREADINFO)]
+    user32.GetGUIThreadInfo.restype = wintypes.BOOL
+    user32.SendMessageTimeoutW.argtypes = [
+        wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM,
+        wintypes.UINT, wintypes.UINT, ctypes.POINTER(ctypes.c_size_t)
+    ]
+    user32.SendMessageTimeoutW.restype = wintypes.LPARAM
+    return user32
+
+
+def focused_text(user32):
+    """Text of the focused control in the foreground window (Notepad's editor), None if unreadable"""
+    info = GUITHREADINFO(cbSize=ctypes.sizeof(GUITHREADINFO))
+    if not user32.GetGUIThreadInfo(0, ctypes.byref(info)) or not info.hwndFocus:
+        return None
+
+    length = ctypes.c_size_t()
+    if not user32.SendMessageTimeoutW(info.hwndFocus, WM_GETTEXTLENGTH, 0, 0,
+                                      SMTO_ABORTIFHUNG, 100, ctypes.byref(length)):
+        return None
+    buf = ctypes.create_unicode_buffer(length.value + 1)
+    copied = ctypes.c_size_t()
+    if not user32.SendMessageTimeoutW(info.hwndFocus, WM_GETTEXT, len(buf), ctypes.addressof(buf),
+                                      SMTO_ABORTIFHUNG, 100, ctypes.byref(copied)):
+        return None
+    return buf.value
+
+
+def wait_for_target(user32, expected, timeout=0.5):
+    """Poll the focused control until `expected` shows up in it; False on timeout"""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        text = focused_text(user32)
+        if text is not None and expected in text:
+            return True
+        time.sleep(0.005)
+    return False
 
 def test_injection_methods():
-    """Compare different injection methods"""
+    """Compare different injection methods; True if every method succeeded"""
     injector = TextInjector()
 
     print("\n=== Injection Method Comparison ===")
     print("Testing different methods with Notepad...")
     print("Open Notepad and press Enter...")
-    input()
+    wait_for_user()
+
+    # The test types and presses Enter; never do that into another app
+    active_app = injector.get_active_application()
+    if active_app != 'notepad':
+        print(f"\n⚠️  Notepad is not the active window (detected: {active_app})!")
+        print("Please click on Notepad and try again.")
+        return False
 
     test_text = "Hello World Test"
 
     methods = ['clipboard', 'paste', 'sendkeys']
 
+    user32 = _target_user32()
+    all_passed = True
     for method in methods:
         print(f"\nTesting method: {method}")
         print(f"Injecting: '{test_text}'")
 
-        success = injector.inject_text(test_text + f" ({method})", method=method)
+        text = test_text + f" ({method})"
+        start = time.perf_counter()
+        success = injector.inject_text(text, method=method)
+
+        # Wait until the text has landed in Notepad rather than sleeping;
+        # 'clipboard' only copies, so there is nothing to wait for
+        if success and method != 'clipboard' and not wait_for_target(user32, text):
+            print("⚠️  Text did not appear in Notepad within the timeout")
+            success = False
+        elapsed = (time.perf_counter() - start) * 1000
 
         if success:
-            print(f"✅ {method} successful")
+            print(f"✅ {method} successful ({elapsed:.0f} ms)")
         else:
             print(f"❌ {method} failed")
+            all_passed = False
 
-        time.sleep(2)
         # Add newline for next test
         injector._send_key(0x0D)  # VK_RETURN
 
+    return all_passed
+
 if __name__ == "__main__":
     print("TranscribeAPP - WhatsApp Fix Test")
     print("=" * 40)
 
+    if AUTO:
+        # Only drive the app that already has focus, so nothing is typed or
+        # sent anywhere else; a skipped test counts as a failure
+        active_app = TextInjector().get_active_application()
+        if active_app == 'whatsapp':
+            passed = test_whatsapp_injection()
+        elif active_app == 'notepad':
+            passed = test_injection_methods()
+        else:
+            print(f"\n⚠️  Focus WhatsApp or Notepad before an auto run (detected: {active_app})")
+            passed = False
+        sys.exit(0 if passed else 1)
+
     while True:
         print("\nSelect test:")
         print("1. Test WhatsApp injection")